@@ -1,8 +1,601 @@
 import math
 import time
 import os
-from typing import Tuple
+from typing import Tuple, List, Optional, Dict
 import random
+import sys
+import hashlib
+import zlib
+import json
+import mmap
+import struct
+import argparse
+import asyncio
+import queue
+import threading
+from decimal import Decimal, localcontext
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+try:
+    import numpy as np  # 可选依赖：有NumPy时走向量化内核
+except ImportError:
+    np = None
+
+
+# 周期检测的容差：轨道回到已记录点的这个范围内就认为进入了周期轨道
+# 这里的吸引不动点收敛很慢（每步只缩小约6%），容差太小几乎不会触发
+PERIODICITY_EPSILON = 1e-6
+# 容差只有在轨道足够接近吸引子后才会触发，迭代上限太低时检测本身的开销得不偿失，
+# 低于这个迭代上限时即使 periodicity=True 也不做周期检测
+PERIODICITY_MIN_ITERATIONS = 500
+# 向量化内核每隔这么多步才比较一次检查点（整个数组比较一次的开销很大）
+PERIODICITY_CHECK_INTERVAL = 8
+
+
+def julia_constant(quantum_state: float) -> complex:
+    """
+    Julia集合参数 c - 只与时间参数有关，每帧算一次即可
+    """
+    return complex(-0.7 + 0.1 * math.sin(quantum_state),
+                   0.27015 + 0.05 * math.cos(quantum_state))
+
+
+def escape_time(z: complex, c: complex, max_iterations: int,
+                periodicity: bool = True) -> Tuple[int, int]:
+    """
+    优化的逃逸时间引擎
+    - 用 |z|² > 4 判断发散，省掉 abs() 里的开方
+    - Brent式周期检测：每隔 1, 2, 4, 8... 步记录一次轨道点，轨道回到记录点说明已进入周期，
+      这个点不会再发散，可以提前结束
+    Args:
+        z: 起始点
+        c: Julia集合参数
+        max_iterations: 最大迭代次数
+        periodicity: 是否启用周期检测（迭代上限低于 PERIODICITY_MIN_ITERATIONS 时不检测）
+    Returns:
+        (逃逸次数, 实际执行的迭代次数)，不发散的点逃逸次数为 max_iterations
+    """
+    periodicity = periodicity and max_iterations >= PERIODICITY_MIN_ITERATIONS
+    x, y = z.real, z.imag
+    cx, cy = c.real, c.imag
+    check_x, check_y = x, y
+    period = 1
+    step = 0
+    
+    for i in range(max_iterations):
+        xx = x * x
+        yy = y * y
+        if xx + yy > 4.0:  # 发散判断条件 |z|² > 4
+            return i, i
+        
+        # z = z² + c，与复数乘法的运算顺序完全一致
+        y = x * y + y * x + cy
+        x = xx - yy + cx
+        
+        if periodicity:
+            if abs(x - check_x) < PERIODICITY_EPSILON and abs(y - check_y) < PERIODICITY_EPSILON:
+                return max_iterations, i + 1
+            step += 1
+            if step == period:
+                step = 0
+                period *= 2
+                check_x, check_y = x, y
+    
+    return max_iterations, max_iterations
+
+
+def compute_reference_orbit(center: Tuple[Decimal, Decimal], c: complex,
+                            max_iterations: int, precision: int) -> List[complex]:
+    """
+    深度缩放的参考轨道 - 用高精度 Decimal 迭代视图中心点，再把每一步舍入成 double 保存
+    Args:
+        center: 视图中心 (实部, 虚部)
+        c: Julia集合参数
+        max_iterations: 最大迭代次数
+        precision: Decimal 有效数字位数
+    Returns:
+        参考轨道 Z_0, Z_1, ...，参考点发散时到发散那一步为止（至少两项）
+    """
+    with localcontext() as ctx:
+        ctx.prec = precision
+        zr, zi = +center[0], +center[1]
+        cr, ci = Decimal(c.real), Decimal(c.imag)
+        orbit = [complex(float(zr), float(zi))]
+        for _ in range(max(1, max_iterations)):
+            zr, zi = zr * zr - zi * zi + cr, 2 * zr * zi + ci
+            orbit.append(complex(float(zr), float(zi)))
+            if zr * zr + zi * zi > 4:
+                break
+    return orbit
+
+
+def perturbation_escape_time(delta: complex, orbit: List[complex],
+                             max_iterations: int) -> Tuple[int, int]:
+    """
+    微扰法逃逸时间 - 像素轨道写成 z_n = Z_n + δ_n，只用 double 迭代偏移量：
+    δ_{n+1} = 2·Z_n·δ_n + δ_n²（Julia集合的 c 对所有像素相同，没有 δc 项）
+    毛刺检测：|z_n| < |δ_n| 说明像素轨道已经偏离参考轨道，继续用这条参考会丢精度；
+    参考轨道用完（参考点先发散）时也无法继续。两种情况都重定基到参考轨道起点。
+    Returns:
+        (逃逸次数, 重定基次数)
+    """
+    last = len(orbit) - 1
+    start = orbit[0]
+    m = 0
+    rebases = 0
+    
+    for i in range(max_iterations):
+        reference = orbit[m]
+        z = reference + delta
+        zz = z.real * z.real + z.imag * z.imag
+        if zz > 4.0:
+            return i, rebases
+        if m == last or (m > 0 and zz < delta.real * delta.real + delta.imag * delta.imag):
+            delta = z - start
+            reference = start
+            m = 0
+            rebases += 1
+        delta = (2 * reference + delta) * delta
+        m += 1
+    
+    return max_iterations, rebases
+
+
+def compute_perturbation_counts(deltas: "np.ndarray", orbit: List[complex],
+                                max_iterations: int) -> Tuple["np.ndarray", int, int]:
+    """
+    NumPy版微扰内核 - 与 perturbation_escape_time 规则相同，每个像素各自记录参考轨道下标
+    Returns:
+        (逃逸次数数组, 实际执行的迭代次数, 重定基次数)
+    """
+    reference_orbit = np.array(orbit, dtype=np.complex128)
+    last = reference_orbit.size - 1
+    counts = np.full(deltas.size, max_iterations, dtype=np.int32)
+    active = np.arange(deltas.size)
+    delta = deltas.astype(np.complex128).ravel()
+    m = np.zeros(deltas.size, dtype=np.int64)
+    iterations = 0
+    rebases = 0
+    
+    for i in range(max_iterations):
+        reference = reference_orbit[m]
+        z = reference + delta
+        zz = z.real * z.real + z.imag * z.imag
+        escaped = zz > 4.0
+        if escaped.any():
+            counts[active[escaped]] = i
+            keep = ~escaped
+            active, delta, m = active[keep], delta[keep], m[keep]
+            reference, z, zz = reference[keep], z[keep], zz[keep]
+            if active.size == 0:
+                break
+        
+        rebase = (m == last) | ((m > 0) & (zz < delta.real * delta.real + delta.imag * delta.imag))
+        if rebase.any():
+            delta[rebase] = z[rebase] - reference_orbit[0]
+            reference[rebase] = reference_orbit[0]
+            m[rebase] = 0
+            rebases += int(rebase.sum())
+        
+        delta = (2 * reference + delta) * delta
+        m += 1
+        iterations += active.size
+    
+    return counts, iterations, rebases
+
+
+def compute_escape_counts(width: int, height: int, quantum_state: float,
+                          max_iterations: int, row_start: int = 0,
+                          row_stop: Optional[int] = None,
+                          periodicity: bool = True) -> Tuple["np.ndarray", int]:
+    """
+    NumPy向量化逃逸时间内核 - 一次性计算整个复数网格的发散迭代次数
+    Args:
+        width, height: 画布尺寸
+        quantum_state: 时间参数
+        max_iterations: 最大迭代次数
+        row_start, row_stop: 只计算 [row_start, row_stop) 这一条行带，默认整幅画布
+        periodicity: 是否启用周期检测（与 escape_time 相同的检查点和迭代上限门槛，
+                     但每 PERIODICITY_CHECK_INTERVAL 步才比较一次）
+    Returns:
+        (形状为 (行数, width) 的整数数组, 实际执行的迭代次数)，未发散的点记为 max_iterations
+    """
+    periodicity = periodicity and max_iterations >= PERIODICITY_MIN_ITERATIONS
+    if row_stop is None:
+        row_stop = height
+    
+    # 与 compute_hyperdimensional_matrix 完全相同的坐标映射
+    xs = np.arange(width)
+    ys = np.arange(row_start, row_stop)
+    real = (xs - width // 2) / (width // 4) + quantum_state * 0.1
+    imag = (ys - height // 2) / (height // 4) + quantum_state * 0.05
+    z = (real[np.newaxis, :] + 1j * imag[:, np.newaxis]).ravel()
+    
+    # c 只与时间参数有关，每帧只算一次 sin/cos
+    c = julia_constant(quantum_state)
+    
+    counts = np.full(z.size, max_iterations, dtype=np.int32)
+    active = np.arange(z.size)  # 仍未发散的点的下标
+    check = z.copy()
+    period = 1
+    step = 0
+    iterations = 0
+    
+    for i in range(max_iterations):
+        escaped = z.real * z.real + z.imag * z.imag > 4.0
+        if escaped.any():
+            counts[active[escaped]] = i
+            keep = ~escaped
+            z = z[keep]
+            active = active[keep]
+            check = check[keep]
+            if active.size == 0:
+                break
+        z = z * z + c
+        iterations += active.size
+        
+        if periodicity:
+            # 已进入周期轨道的点保持 max_iterations，直接移出活动集合；
+            # 轨道停在周期上之后任何时候比较都会命中，隔几步比较一次只是晚几步发现
+            if (step + 1) % PERIODICITY_CHECK_INTERVAL == 0:
+                settled = ((np.abs(z.real - check.real) < PERIODICITY_EPSILON)
+                           & (np.abs(z.imag - check.imag) < PERIODICITY_EPSILON))
+                if settled.any():
+                    keep = ~settled
+                    z = z[keep]
+                    active = active[keep]
+                    check = check[keep]
+                    if active.size == 0:
+                        break
+            step += 1
+            if step == period:
+                step = 0
+                period *= 2
+                check = z.copy()
+    
+    return counts.reshape(row_stop - row_start, width), iterations
+
+
+def _render_band(generator: "QuantumFractalGenerator", row_start: int,
+                 row_stop: int) -> Tuple[bytes, Tuple[int, int]]:
+    """
+    进程池里执行的行带渲染任务 - 必须是模块级函数才能被pickle
+    返回该行带的字符下标字节串（每个像素一个字节，比字符列表小得多）和迭代统计
+    """
+    band = bytearray((row_stop - row_start) * generator.width)
+    stats = generator._render_rows(row_start, row_stop, memoryview(band))
+    return bytes(band), stats
+
+
+class AnsiFrameWriter:
+    """
+    增量终端输出层 - 记住上一帧的内容，只用光标定位转义序列重绘变化的字符
+    """
+    
+    # 两段变化之间相隔不超过这么多字符时直接连着重写，比再发一次光标定位更省字节
+    MERGE_GAP = 6
+    
+    def __init__(self, stream=None):
+        """
+        Args:
+            stream: 输出流，默认为标准输出
+        """
+        self.stream = stream or sys.stdout
+        self._previous_text: List[str] = []
+        self._previous_grid: List[str] = []
+        self.last_bytes = 0    # 上一帧写出的字节数
+        self.total_bytes = 0
+        self.frames = 0
+        
+        if os.name == 'nt':
+            os.system('')  # 让Windows控制台启用ANSI转义序列支持
+    
+    def invalidate(self) -> None:
+        """
+        屏幕被其他输出弄乱后调用，下一帧会整屏重绘
+        """
+        self._previous_text = []
+        self._previous_grid = []
+    
+    def write_frame(self, header: List[str], grid: List[str], footer: List[str]) -> int:
+        """
+        输出一帧并返回本帧写出的字节数
+        Args:
+            header: 画布上方的文字行（可能含宽字符，变化时整行重写）
+            grid: 画布行（单宽字符，逐字符比较）
+            footer: 画布下方的文字行
+        """
+        text = header + footer
+        parts = []
+        
+        if (len(text) != len(self._previous_text) or len(grid) != len(self._previous_grid)
+                or any(len(a) != len(b) for a, b in zip(grid, self._previous_grid))):
+            # 第一帧或布局变化：清屏后整屏输出
+            parts.append('\x1b[?25l\x1b[2J\x1b[H')
+            parts.append('\n'.join(header + grid + footer))
+        else:
+            for i, line in enumerate(header):
+                if line != self._previous_text[i]:
+                    parts.append(f'\x1b[{i + 1};1H{line}\x1b[K')
+            
+            top = len(header) + 1
+            for i, (line, old) in enumerate(zip(grid, self._previous_grid)):
+                if line != old:
+                    self._diff_row(parts, top + i, line, old)
+            
+            top += len(grid)
+            for i, line in enumerate(footer):
+                if line != self._previous_text[len(header) + i]:
+                    parts.append(f'\x1b[{top + i};1H{line}\x1b[K')
+        
+        # 光标停在画面下方，方便后续正常打印
+        parts.append(f'\x1b[{len(header) + len(grid) + len(footer) + 1};1H')
+        
+        payload = ''.join(parts)
+        self.stream.write(payload)
+        self.stream.flush()
+        
+        self._previous_text = text
+        self._previous_grid = grid
+        self.last_bytes = len(payload.encode('utf-8'))
+        self.total_bytes += self.last_bytes
+        self.frames += 1
+        return self.last_bytes
+    
+    def _diff_row(self, parts: List[str], row: int, line: str, old: str) -> None:
+        """
+        找出一行中变化的字符段，每段只发一次光标定位
+        """
+        run_start = -1
+        last_changed = -1
+        for x, (new_char, old_char) in enumerate(zip(line, old)):
+            if new_char == old_char:
+                continue
+            if run_start >= 0 and x - last_changed - 1 > self.MERGE_GAP:
+                parts.append(f'\x1b[{row};{run_start + 1}H{line[run_start:last_changed + 1]}')
+                run_start = -1
+            if run_start < 0:
+                run_start = x
+            last_changed = x
+        if run_start >= 0:
+            parts.append(f'\x1b[{row};{run_start + 1}H{line[run_start:last_changed + 1]}')
+    
+    def finish(self) -> None:
+        """
+        动画结束：恢复光标显示并清空记忆
+        """
+        self.stream.write('\x1b[?25h')
+        self.stream.flush()
+        self.invalidate()
+
+
+class FrameCache:
+    """
+    帧缓存 - 内存LRU + 可选的磁盘存储，循环动画和重复运行可以直接回放
+    """
+    
+    def __init__(self, capacity: int = 64, cache_dir: Optional[str] = None):
+        """
+        Args:
+            capacity: 内存中最多保留的帧数
+            cache_dir: 磁盘缓存目录，None 表示只用内存
+        """
+        if capacity < 1:
+            raise ValueError("缓存容量必须是正整数")
+        
+        self.capacity = capacity
+        self.cache_dir = cache_dir
+        self._frames: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+    
+    def get(self, key: Tuple) -> Optional[bytes]:
+        """
+        查找一帧，命中时返回字符下标字节串
+        """
+        frame = self._frames.get(key)
+        if frame is not None:
+            self._frames.move_to_end(key)
+            self.hits += 1
+            return frame
+        
+        frame = self._load(key)
+        if frame is not None:
+            self.disk_hits += 1
+            self._remember(key, frame)
+            return frame
+        
+        self.misses += 1
+        return None
+    
+    def put(self, key: Tuple, frame: bytes) -> None:
+        """
+        存入一帧（内存，若配置了目录也写入磁盘）
+        """
+        self._remember(key, frame)
+        if self.cache_dir:
+            self._store(key, frame)
+    
+    def _remember(self, key: Tuple, frame: bytes) -> None:
+        """放入内存并按LRU淘汰最久未用的帧"""
+        self._frames[key] = frame
+        self._frames.move_to_end(key)
+        while len(self._frames) > self.capacity:
+            self._frames.popitem(last=False)
+    
+    def _path(self, key: Tuple) -> str:
+        """磁盘文件名取键的哈希"""
+        digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.frame")
+    
+    def _store(self, key: Tuple, frame: bytes) -> None:
+        """
+        紧凑格式写盘：字符下标字节串再用zlib压缩
+        """
+        path = self._path(key)
+        temp_path = path + '.tmp'
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(zlib.compress(frame))
+            os.replace(temp_path, path)  # 原子替换，避免读到半个文件
+        except OSError:
+            pass  # 磁盘缓存只是加速手段，写失败不影响动画
+    
+    def _load(self, key: Tuple) -> Optional[bytes]:
+        """从磁盘读取一帧，文件缺失或损坏时返回 None"""
+        if not self.cache_dir:
+            return None
+        
+        width, height, symbols = key[0], key[1], key[-1]
+        try:
+            with open(self._path(key), 'rb') as f:
+                data = zlib.decompress(f.read())
+        except (OSError, zlib.error):
+            return None
+        if len(data) != width * height or (data and max(data) >= len(symbols)):
+            return None
+        return data
+
+
+class FrameScheduler:
+    """
+    按截止时间调度的帧调度器 - 目标帧率下自适应调整迭代次数和分辨率
+    每帧用 perf_counter 测量渲染耗时：太慢就降低迭代次数（到下限后再降分辨率），
+    有富余就先恢复分辨率再提高迭代次数；sleep 只睡到下一帧的截止时间为止。
+    """
+    
+    def __init__(self, target_fps: float = 1 / 0.3,
+                 min_iterations: int = 10,
+                 max_iterations: Optional[int] = None,
+                 adapt_resolution: bool = True,
+                 min_scale: float = 0.5,
+                 render_share: float = 0.7,
+                 history: int = 1000):
+        """
+        Args:
+            target_fps: 目标帧率（默认与原来固定 sleep 0.3 秒的节奏一致）
+            min_iterations: 迭代次数下限
+            max_iterations: 迭代次数上限，None 表示不超过生成器原本的设置
+            adapt_resolution: 迭代次数降到下限仍然超时，是否继续降低分辨率
+            min_scale: 分辨率最低缩放比例
+            render_share: 一帧时间里留给渲染的比例，其余留给显示
+            history: 保留最近多少帧的计时统计
+        """
+        if target_fps <= 0:
+            raise ValueError("目标帧率必须大于0")
+        
+        self.frame_budget = 1 / target_fps
+        self.min_iterations = min_iterations
+        self.max_iterations = max_iterations
+        self.adapt_resolution = adapt_resolution
+        self.min_scale = min_scale
+        self.render_share = render_share
+        self.stats: deque = deque(maxlen=history)
+        self.dropped_frames = 0  # 没能在截止时间前完成的帧数（每帧最多算一次）
+        self.missed_deadlines = 0  # 被跳过的截止时间槽位总数（一帧严重超时会跳过好几个）
+        self.scale = 1.0
+        self.iterations = 0  # 下一帧要用的迭代次数
+        self._base_dimensions: Optional[Tuple[int, int]] = None
+        self._next_deadline = 0.0
+    
+    @property
+    def last(self) -> Optional[Dict]:
+        """最近一帧的计时统计"""
+        return self.stats[-1] if self.stats else None
+    
+    def start(self, generator: "QuantumFractalGenerator") -> None:
+        """
+        动画开始前调用：记下基准分辨率和迭代上限，设定第一帧的截止时间
+        """
+        self._base_dimensions = (generator.width, generator.height)
+        if self.max_iterations is None:
+            self.max_iterations = generator.max_iterations
+        self.iterations = generator.max_iterations
+        self.scale = 1.0
+        self._next_deadline = time.perf_counter() + self.frame_budget
+    
+    def apply(self, generator: "QuantumFractalGenerator") -> None:
+        """
+        渲染每帧之前调用：把当前选定的迭代次数和分辨率应用到生成器上
+        调整决策只记录在调度器里，流水线模式下由渲染线程自己在帧与帧之间应用，不会改到正在渲染的帧
+        """
+        generator.max_iterations = self.iterations
+        base_width, base_height = self._base_dimensions
+        dimensions = (max(4, round(base_width * self.scale)), max(4, round(base_height * self.scale)))
+        if dimensions != (generator.width, generator.height):
+            generator.resize(dimensions)
+    
+    def record(self, generator: "QuantumFractalGenerator", frame: int,
+               render_seconds: float, display_seconds: float) -> None:
+        """记录刚显示的一帧的计时，并据此决定后续帧的画质"""
+        self.stats.append({
+            'frame': frame,
+            'render_ms': render_seconds * 1000,
+            'display_ms': display_seconds * 1000,
+            'iterations': generator.max_iterations,
+            'dimensions': (generator.width, generator.height),
+            'missed_deadlines': 0  # 由随后的 wait() 填写
+        })
+        self._adapt(render_seconds)
+    
+    def _adapt(self, render_seconds: float) -> None:
+        """
+        按渲染耗时与渲染预算的比值调整画质，每帧最多调整一步，避免来回震荡
+        """
+        budget = self.frame_budget * self.render_share
+        ratio = budget / render_seconds if render_seconds > 0 else float('inf')
+        
+        if ratio < 0.9:  # 超时：先降迭代次数，到下限后再降分辨率
+            if self.iterations > self.min_iterations:
+                self.iterations = max(self.min_iterations, int(self.iterations * max(ratio, 0.5)))
+            elif self.adapt_resolution and self.scale > self.min_scale:
+                self.scale = max(self.min_scale, self.scale * 0.8)
+        elif ratio > 1.5:  # 有富余：先恢复分辨率，再提高迭代次数
+            if self.scale < 1.0:
+                self.scale = min(1.0, self.scale * 1.25)
+            elif self.iterations < self.max_iterations:
+                self.iterations = min(self.max_iterations, int(self.iterations * min(ratio, 1.25)) + 1)
+    
+    def wait(self) -> None:
+        """
+        只睡到下一帧的截止时间；已经错过截止时间则不睡，这一帧记为掉帧，
+        错过的截止时间槽位数记在这一帧的统计里
+        """
+        now = time.perf_counter()
+        slack = self._next_deadline - now
+        if slack > 0:
+            time.sleep(slack)
+            self._next_deadline += self.frame_budget
+        else:
+            missed = int(-slack // self.frame_budget) + 1
+            self.dropped_frames += 1
+            self.missed_deadlines += missed
+            if self.stats:
+                self.stats[-1]['missed_deadlines'] = missed
+            self._next_deadline += missed * self.frame_budget
+            if self._next_deadline <= now:
+                self._next_deadline = now + self.frame_budget
+    
+    def summary(self) -> Dict:
+        """汇总计时统计"""
+        frames = len(self.stats)
+        if not frames:
+            return {'frames': 0, 'avg_render_ms': 0.0, 'avg_display_ms': 0.0,
+                    'max_render_ms': 0.0, 'dropped_frames': self.dropped_frames,
+                    'missed_deadlines': self.missed_deadlines}
+        return {
+            'frames': frames,
+            'avg_render_ms': sum(s['render_ms'] for s in self.stats) / frames,
+            'avg_display_ms': sum(s['display_ms'] for s in self.stats) / frames,
+            'max_render_ms': max(s['render_ms'] for s in self.stats),
+            'dropped_frames': self.dropped_frames,
+            'missed_deadlines': self.missed_deadlines
+        }
 
 
 class QuantumFractalGenerator:
@@ -11,16 +604,104 @@ class QuantumFractalGenerator:
     优化版本：修复了类型提示，增加了性能优化和错误处理
     """
     
-    def __init__(self, dimensions: Tuple[int, int] = (80, 40)):
+    def __init__(self, dimensions: Tuple[int, int] = (80, 40),
+                 backend: str = 'auto',
+                 workers: Optional[int] = 1,
+                 tile_rows: Optional[int] = None,
+                 executor: str = 'process',
+                 frame_cache: Optional[FrameCache] = None,
+                 render_mode: str = 'full',
+                 max_iterations: int = 30,
+                 periodicity: bool = True,
+                 symmetry: bool = True,
+                 zoom_center: Tuple[str, str] = ('0', '0'),
+                 zoom_scale: float = 1.0,
+                 zoom_per_frame: float = 1.0):
         """
         初始化量子分形生成器
         Args:
             dimensions: 画布尺寸 (宽度, 高度)
+            backend: 计算后端 ('auto', 'numpy', 'python')，缺少NumPy时自动退回纯Python
+            workers: 并行渲染的工作者数量，1 为单线程，None 为CPU核数
+            tile_rows: 每个行带的行数，None 时按工作者数量自动切分
+            executor: 并行方式 ('process', 'thread')，NumPy内核释放GIL时可用线程池
+            frame_cache: 帧缓存，相同参数的帧只计算一次
+            render_mode: 渲染模式 ('full' 逐像素, 'boundary' 边界追踪矩形细分,
+                         'perturbation' 微扰法深度缩放)
+            max_iterations: 最大迭代次数，开启周期检测后可以放心调到几百
+            periodicity: 是否启用周期检测，提前结束已进入周期轨道的点
+            symmetry: 采样网格关于原点中心对称时只算一半像素，另一半镜像填充
+            zoom_center: 深度缩放模式的视图中心（字符串，保留任意精度）
+            zoom_scale: 深度缩放模式的缩放比例，1.0 对应默认的 ±2 视窗
+            zoom_per_frame: 动画中每帧缩放比例的乘数，例如 0.5 表示每帧放大一倍
         """
+        if backend not in ('auto', 'numpy', 'python'):
+            raise ValueError("后端必须是 'auto', 'numpy', 或 'python'")
+        if executor not in ('process', 'thread'):
+            raise ValueError("并行方式必须是 'process' 或 'thread'")
+        if render_mode not in ('full', 'boundary', 'perturbation'):
+            raise ValueError("渲染模式必须是 'full', 'boundary' 或 'perturbation'")
+        
         self.width, self.height = dimensions
-        self.canvas = [[' ' for _ in range(self.width)] for _ in range(self.height)]
+        # 画布按行展平存放字符下标（每像素一个字节），显示时再查表换成字符
+        self.canvas = bytearray(self.width * self.height)
         self.quantum_state = 0.0  # 其实就是一个时间参数
-        self.symbols = [' ', '·', '░', '▒', '▓', '█']  # 预定义字符集
+        self.symbols = [' ', '·', '░', '▒', '▓', '█']  # 预定义字符集，下标0必须是空白
+        self.max_iterations = max_iterations
+        self.backend = 'numpy' if backend != 'python' and np is not None else 'python'
+        self.render_mode = render_mode
+        self.periodicity = periodicity
+        self.symmetry = symmetry
+        self.last_symmetry_used = False  # 上一帧是否用上了对称加速
+        
+        # 深度缩放（微扰法）视图参数
+        self.zoom_center = (Decimal(zoom_center[0]), Decimal(zoom_center[1]))
+        self.zoom_start_scale = zoom_scale
+        self.zoom_scale = zoom_scale
+        self.zoom_per_frame = zoom_per_frame
+        self._reference_key: Optional[Tuple] = None
+        self._reference_orbit: List[complex] = []
+        self.last_iterations = 0  # 上一帧实际执行的迭代总次数
+        self.last_iterations_saved = 0  # 上一帧周期检测省下的迭代次数
+        
+        # 并行渲染配置，进程池/线程池在第一次使用时才创建并跨帧复用
+        self.workers = workers or os.cpu_count() or 1
+        self.tile_rows = tile_rows
+        self.executor_kind = executor
+        self._executor = None
+        
+        self.frame_cache = frame_cache
+        
+        # 增量终端输出层，代替每帧 clear + 逐行 print
+        self.display = AnsiFrameWriter()
+        self.scheduler: Optional[FrameScheduler] = None
+    
+    def __getstate__(self) -> dict:
+        """
+        发送给子进程时不携带画布和进程池，只传渲染参数
+        """
+        state = self.__dict__.copy()
+        state['canvas'] = bytearray()
+        state['_executor'] = None
+        state['display'] = None
+        state['frame_cache'] = None
+        state['scheduler'] = None
+        return state
+    
+    def close(self) -> None:
+        """
+        关闭并行渲染用的进程池/线程池
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+    
+    def resize(self, dimensions: Tuple[int, int]) -> None:
+        """
+        调整画布尺寸（自适应画质时使用），画布内容清空
+        """
+        self.width, self.height = dimensions
+        self.canvas = bytearray(self.width * self.height)
         
     def compute_hyperdimensional_matrix(self, x: int, y: int) -> complex:
         """
@@ -36,45 +717,440 @@ class QuantumFractalGenerator:
         应用量子变换 - 其实就是Julia集合的迭代公式
         """
         # Julia集合公式，c值会随时间变化产生动画效果
-        c = complex(-0.7 + 0.1 * math.sin(self.quantum_state), 
-                   0.27015 + 0.05 * math.cos(self.quantum_state))
-        return z * z + c
+        return z * z + julia_constant(self.quantum_state)
+    
+    def escape_count(self, z: complex) -> int:
+        """
+        计算逃逸次数 - 发散前经过的迭代次数，不发散时为 max_iterations
+        """
+        count, _ = escape_time(z, julia_constant(self.quantum_state),
+                               self.max_iterations, self.periodicity)
+        return count
     
     def calculate_convergence_probability(self, z: complex) -> float:
         """
         计算收敛概率 - 实际上就是检查Julia集合的收敛性
         """
-        max_iterations = 30  # 增加迭代次数以获得更好的效果
-        current_z = z
-        
-        for i in range(max_iterations):
-            if abs(current_z) > 2.0:  # 发散判断条件
-                return i / max_iterations  # 返回归一化的发散速度
-            current_z = self.apply_quantum_transformation(current_z, i)
-        
-        return 1.0  # 收敛情况
+        return self.escape_count(z) / self.max_iterations  # 返回归一化的发散速度
     
     def render_quantum_field(self) -> None:
         """
         渲染量子场 - 其实就是计算每个像素点的Julia集合值并映射到字符
         """
-        for y in range(self.height):
+        self.last_iterations, self.last_iterations_saved = self._render_into(self.canvas)
+    
+    def _render_into(self, canvas: bytearray) -> Tuple[int, int]:
+        """
+        按当前参数渲染一帧到 canvas（先查帧缓存），返回迭代统计
+        """
+        if self.frame_cache is not None:
+            key = self._frame_key()
+            frame = self.frame_cache.get(key)
+            if frame is not None:
+                canvas[:] = frame
+                return 0, 0
+        
+        stats = self._render_frame(canvas)
+        
+        if self.frame_cache is not None:
+            # 缓存的是未加噪声的干净帧，噪声在查找之后才叠加
+            self.frame_cache.put(key, bytes(canvas))
+        return stats
+    
+    def _render_clone(self) -> "QuantumFractalGenerator":
+        """
+        流水线模式下给后台渲染线程用的副本：渲染参数独立，共享帧缓存和进程池
+        """
+        clone = QuantumFractalGenerator.__new__(QuantumFractalGenerator)
+        clone.__dict__.update(self.__getstate__())
+        clone.frame_cache = self.frame_cache
+        clone._executor = self._executor
+        return clone
+    
+    def canvas_rows(self) -> List[str]:
+        """
+        把下标画布转换为逐行字符串 - 每行从memoryview切片一次查表完成
+        """
+        table = dict(enumerate(self.symbols))
+        view = memoryview(self.canvas)
+        width = self.width
+        return [str(view[start:start + width], 'latin-1').translate(table)
+                for start in range(0, width * self.height, width)]
+    
+    def _frame_key(self) -> Tuple:
+        """
+        帧缓存键：决定一帧内容的全部参数
+        """
+        view = self.render_mode
+        if self.render_mode == 'perturbation':
+            view = (self.render_mode, str(self.zoom_center[0]), str(self.zoom_center[1]),
+                    repr(self.zoom_scale))
+        return (self.width, self.height, self.quantum_state,
+                self.max_iterations, view, tuple(self.symbols))
+    
+    def _advance_to(self, cycle: int) -> None:
+        """
+        设置第 cycle 帧的时间参数（深度缩放模式下同时更新缩放比例）
+        """
+        self.quantum_state = cycle * 0.2
+        if self.render_mode == 'perturbation':
+            self.zoom_scale = self.zoom_start_scale * self.zoom_per_frame ** cycle
+    
+    def _render_frame(self, canvas: bytearray) -> Tuple[int, int]:
+        """
+        渲染整帧到 canvas
+        Julia集合关于 z → −z 对称：f(−z) = z² + c = f(z)。采样网格中心对称时，
+        只计算上半部分的行（以及找不到对称行的行），其余行从对称行反转复制，
+        个别找不到对称列的像素单独计算。
+        """
+        if self.render_mode == 'perturbation':
+            # 参考轨道整帧共用，先在主进程算好，再随生成器一起发给各个工作者
+            self._ensure_reference_orbit()
+        
+        symmetry = self._point_symmetry() if self.symmetry else None
+        self.last_symmetry_used = symmetry is not None
+        if symmetry is None:
+            return self._render_ranges(canvas, [(0, self.height)])
+        
+        mirror_x, mirror_y = symmetry
+        width, height = self.width, self.height
+        
+        # 需要真正计算的行：没有对称行的行，以及成对行中靠上的那一行
+        ranges: List[Tuple[int, int]] = []
+        for y in range(height):
+            if 0 <= mirror_y - y < height and y > mirror_y - y:
+                continue
+            if ranges and ranges[-1][1] == y:
+                ranges[-1] = (ranges[-1][0], y + 1)
+            else:
+                ranges.append((y, y + 1))
+        iterations, saved = self._render_ranges(canvas, ranges)
+        
+        # 镜像填充：第 y 行第 x 列 = 第 mirror_y-y 行第 mirror_x-x 列
+        low = max(0, mirror_x - (width - 1))
+        high = min(width - 1, mirror_x)
+        lookup = self._symbol_lookup()
+        c = julia_constant(self.quantum_state)
+        for y in range(height):
+            source_y = mirror_y - y
+            if not (0 <= source_y < height) or y <= source_y:
+                continue
+            row = y * width
+            source = source_y * width
+            canvas[row + low:row + high + 1] = \
+                canvas[source + mirror_x - high:source + mirror_x - low + 1][::-1]
+            for x in list(range(0, low)) + list(range(high + 1, width)):
+                count, done = escape_time(self.compute_hyperdimensional_matrix(x, y), c,
+                                          self.max_iterations, self.periodicity)
+                canvas[row + x] = lookup[count]
+                iterations += done
+                saved += count - done
+        return iterations, saved
+    
+    def _point_symmetry(self) -> Optional[Tuple[int, int]]:
+        """
+        检测采样网格是否关于复平面原点中心对称
+        Returns:
+            (mirror_x, mirror_y)：像素 (x, y) 的对称像素为 (mirror_x - x, mirror_y - y)；
+            不对称时返回 None
+        """
+        if self.width // 4 == 0 or self.height // 4 == 0 or self.render_mode == 'perturbation':
+            return None
+        reals = [self.compute_hyperdimensional_matrix(x, 0).real for x in range(self.width)]
+        imags = [self.compute_hyperdimensional_matrix(0, y).imag for y in range(self.height)]
+        mirror_x = self._mirror_offset(reals)
+        mirror_y = self._mirror_offset(imags)
+        if mirror_x is None or mirror_y is None:
+            return None
+        return mirror_x, mirror_y
+    
+    @staticmethod
+    def _mirror_offset(values: List[float]) -> Optional[int]:
+        """
+        在等差坐标序列中找 s，使得所有 values[s - i] 都精确等于 -values[i]
+        必须是浮点数精确相反，镜像出来的结果才会与直接计算逐位一致
+        """
+        if len(values) < 2:
+            return 0 if values and values[0] == 0.0 else None
+        step = values[1] - values[0]
+        if step == 0:
+            return None
+        offset = round(-2 * values[0] / step)
+        if not 0 <= offset <= 2 * (len(values) - 1):
+            return None
+        for i, value in enumerate(values):
+            j = offset - i
+            if 0 <= j < len(values) and values[j] != -value:
+                return None
+        return offset
+    
+    def _render_ranges(self, canvas: bytearray, ranges: List[Tuple[int, int]]) -> Tuple[int, int]:
+        """
+        渲染若干行区间，workers > 1 时并行
+        """
+        if self.workers > 1:
+            return self._render_parallel(canvas, ranges)
+        
+        view = memoryview(canvas)
+        width = self.width
+        iterations = saved = 0
+        for start, stop in ranges:
+            band_iterations, band_saved = self._render_rows(start, stop, view[start * width:stop * width])
+            iterations += band_iterations
+            saved += band_saved
+        return iterations, saved
+    
+    def _band_bounds(self, ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """
+        把要渲染的行区间切分为行带 - 默认每个工作者分到约4个行带，便于负载均衡
+        """
+        total = sum(stop - start for start, stop in ranges)
+        rows = self.tile_rows or max(1, math.ceil(total / (self.workers * 4)))
+        return [(band_start, min(band_start + rows, stop))
+                for start, stop in ranges
+                for band_start in range(start, stop, rows)]
+    
+    def _render_parallel(self, canvas: bytearray, ranges: List[Tuple[int, int]]) -> Tuple[int, int]:
+        """
+        多核分块渲染 - 线程直接写入画布缓冲区的各自切片，进程返回字节串后拷回
+        返回所有行带合计的 (迭代次数, 省下的迭代次数)
+        """
+        if self._executor is None:
+            pool_class = ProcessPoolExecutor if self.executor_kind == 'process' else ThreadPoolExecutor
+            self._executor = pool_class(max_workers=self.workers)
+        
+        view = memoryview(canvas)
+        width = self.width
+        bands = self._band_bounds(ranges)
+        
+        if self.executor_kind == 'process':
+            futures = [self._executor.submit(_render_band, self, start, stop)
+                       for start, stop in bands]
+            results = []
+            for (start, stop), future in zip(bands, futures):
+                band, stats = future.result()
+                view[start * width:stop * width] = band
+                results.append(stats)
+        else:
+            futures = [self._executor.submit(self._render_rows, start, stop,
+                                             view[start * width:stop * width])
+                       for start, stop in bands]
+            results = [future.result() for future in futures]
+        
+        return (sum(iterations for iterations, _ in results),
+                sum(saved for _, saved in results))
+    
+    def _render_rows(self, row_start: int, row_stop: int, out: memoryview) -> Tuple[int, int]:
+        """
+        渲染 [row_start, row_stop) 行带，把字符下标写入 out（该行带对应的缓冲区切片）
+        返回 (实际执行的迭代次数, 周期检测省下的迭代次数)
+        """
+        if self.render_mode == 'boundary':
+            return self._render_rows_boundary(row_start, row_stop, out)
+        if self.render_mode == 'perturbation':
+            return self._render_rows_perturbation(row_start, row_stop, out)
+        if self.backend == 'numpy':
+            return self._render_rows_numpy(row_start, row_stop, out)
+        return self._render_rows_python(row_start, row_stop, out)
+    
+    def _symbol_lookup(self) -> List[int]:
+        """
+        逃逸次数 → 字符下标查找表，与逐像素路径的映射规则完全一致
+        """
+        n = len(self.symbols)
+        return [min(int(i / self.max_iterations * n), n - 1)
+                for i in range(self.max_iterations + 1)]
+    
+    def _render_rows_numpy(self, row_start: int, row_stop: int, out: memoryview) -> Tuple[int, int]:
+        """
+        向量化渲染 - 整个网格一起迭代，再用一次索引把逃逸次数映射为字符下标
+        """
+        target = np.frombuffer(out, dtype=np.uint8)
+        if self.width // 4 == 0 or self.height // 4 == 0:
+            # 与纯Python路径的 ZeroDivisionError 处理保持一致
+            target[:] = 0
+            return 0, 0
+        
+        counts, iterations = compute_escape_counts(self.width, self.height,
+                                                   self.quantum_state, self.max_iterations,
+                                                   row_start, row_stop, self.periodicity)
+        lookup = np.array(self._symbol_lookup(), dtype=np.uint8)
+        target[:] = lookup[counts].ravel()
+        return iterations, int(counts.sum()) - iterations
+    
+    def _render_rows_python(self, row_start: int, row_stop: int, out: memoryview) -> Tuple[int, int]:
+        """
+        纯Python逐像素渲染 - 没有NumPy时的后备路径
+        """
+        lookup = self._symbol_lookup()
+        c = julia_constant(self.quantum_state)
+        offset = -row_start * self.width
+        iterations = 0
+        saved = 0
+        for y in range(row_start, row_stop):
             for x in range(self.width):
                 try:
                     # 获取当前点的复数坐标
                     z = self.compute_hyperdimensional_matrix(x, y)
                     
-                    # 计算"量子概率"（实际是收敛速度）
-                    probability = self.calculate_convergence_probability(z)
+                    # 计算逃逸次数（即"量子概率"对应的收敛速度）
+                    count, done = escape_time(z, c, self.max_iterations, self.periodicity)
+                    iterations += done
+                    saved += count - done
                     
-                    # 根据概率选择显示字符
-                    symbol_index = min(int(probability * len(self.symbols)), 
-                                     len(self.symbols) - 1)
-                    self.canvas[y][x] = self.symbols[symbol_index]
+                    # 根据收敛速度选择显示字符
+                    out[offset + y * self.width + x] = lookup[count]
                     
                 except (ZeroDivisionError, OverflowError):
                     # 处理数值计算异常
-                    self.canvas[y][x] = ' '
+                    out[offset + y * self.width + x] = 0
+        return iterations, saved
+    
+    def _render_rows_boundary(self, row_start: int, row_stop: int, out: memoryview) -> Tuple[int, int]:
+        """
+        边界追踪渲染（Mariani–Silver 矩形细分）
+        只计算矩形边框上的点：边框逃逸次数全部相同就直接填充内部，否则四等分后递归处理。
+        大片同色区域不再逐像素迭代到 max_iterations。
+        """
+        width = self.width
+        band_height = row_stop - row_start
+        if width == 0 or band_height == 0:
+            return 0, 0
+        
+        counts: List[Optional[int]] = [None] * (width * band_height)
+        c = julia_constant(self.quantum_state)
+        iterations = 0
+        saved = 0
+        
+        def evaluate(x: int, y: int) -> int:
+            """按需计算单个像素的逃逸次数（已算过的直接复用），-1 表示数值异常"""
+            nonlocal iterations, saved
+            index = y * width + x
+            value = counts[index]
+            if value is None:
+                try:
+                    z = self.compute_hyperdimensional_matrix(x, row_start + y)
+                    value, done = escape_time(z, c, self.max_iterations, self.periodicity)
+                    iterations += done
+                    saved += value - done
+                except (ZeroDivisionError, OverflowError):
+                    value = -1
+                counts[index] = value
+            return value
+        
+        stack = [(0, 0, width - 1, band_height - 1)]
+        while stack:
+            x0, y0, x1, y1 = stack.pop()
+            
+            # 矩形太小时细分不划算，直接逐像素计算
+            if x1 - x0 < 3 or y1 - y0 < 3:
+                for y in range(y0, y1 + 1):
+                    for x in range(x0, x1 + 1):
+                        evaluate(x, y)
+                continue
+            
+            first = evaluate(x0, y0)
+            border = [(x, y0) for x in range(x0, x1 + 1)] + [(x, y1) for x in range(x0, x1 + 1)]
+            border += [(x0, y) for y in range(y0 + 1, y1)] + [(x1, y) for y in range(y0 + 1, y1)]
+            uniform = all(evaluate(x, y) == first for x, y in border)
+            
+            if uniform:
+                for y in range(y0 + 1, y1):
+                    row = y * width
+                    for x in range(x0 + 1, x1):
+                        if counts[row + x] is None:
+                            counts[row + x] = first
+                continue
+            
+            # 子矩形共享分割线，分割线上的点只会计算一次
+            xm = (x0 + x1) // 2
+            ym = (y0 + y1) // 2
+            stack.extend([(x0, y0, xm, ym), (xm, y0, x1, ym),
+                          (x0, ym, xm, y1), (xm, ym, x1, y1)])
+        
+        lookup = self._symbol_lookup()
+        for index, value in enumerate(counts):
+            out[index] = lookup[value] if value >= 0 else 0
+        return iterations, saved
+    
+    def _ensure_reference_orbit(self) -> List[complex]:
+        """
+        计算（或复用）本帧的高精度参考轨道
+        精度随缩放深度增加：每放大10倍多保留一位有效数字，另留20位余量
+        """
+        c = julia_constant(self.quantum_state)
+        depth = max(0, int(-math.log10(self.zoom_scale))) if self.zoom_scale > 0 else 0
+        key = (self.zoom_center, c, self.max_iterations, depth)
+        if key != self._reference_key:
+            self._reference_orbit = compute_reference_orbit(self.zoom_center, c,
+                                                            self.max_iterations, depth + 20)
+            self._reference_key = key
+        return self._reference_orbit
+    
+    def _render_rows_perturbation(self, row_start: int, row_stop: int, out: memoryview) -> Tuple[int, int]:
+        """
+        微扰法深度缩放渲染 - 只有视图中心用高精度迭代，其余像素都是相对参考轨道的 double 偏移量
+        像素 (x, y) 的初始偏移与默认视窗的坐标映射一致，再乘以缩放比例
+        """
+        width = self.width
+        if self.width // 4 == 0 or self.height // 4 == 0:
+            for index in range(len(out)):
+                out[index] = 0
+            return 0, 0
+        
+        orbit = self._ensure_reference_orbit()
+        lookup = self._symbol_lookup()
+        scale = self.zoom_scale
+        real_step = scale / (self.width // 4)
+        imag_step = scale / (self.height // 4)
+        
+        if self.backend == 'numpy':
+            xs = (np.arange(width) - width // 2) * real_step
+            ys = (np.arange(row_start, row_stop) - self.height // 2) * imag_step
+            deltas = (xs[np.newaxis, :] + 1j * ys[:, np.newaxis]).ravel()
+            counts, iterations, _ = compute_perturbation_counts(deltas, orbit, self.max_iterations)
+            np.frombuffer(out, dtype=np.uint8)[:] = np.array(lookup, dtype=np.uint8)[counts]
+            return iterations, 0
+        
+        iterations = 0
+        index = 0
+        for y in range(row_start, row_stop):
+            imag = (y - self.height // 2) * imag_step
+            for x in range(width):
+                count, _ = perturbation_escape_time(complex((x - width // 2) * real_step, imag),
+                                                    orbit, self.max_iterations)
+                out[index] = lookup[count]
+                iterations += count
+                index += 1
+        return iterations, 0
+    
+    def verify_render_mode(self) -> Dict:
+        """
+        用逐像素暴力渲染核对当前渲染模式（含对称加速）在本帧上的输出
+        Returns:
+            包含不一致像素数和两种方式迭代次数的字典
+        """
+        size = self.width * self.height
+        fast = bytearray(size)
+        fast_iterations, _ = self._render_frame(fast)
+        
+        saved_mode = self.render_mode
+        self.render_mode = 'full'
+        try:
+            brute = bytearray(size)
+            brute_iterations, _ = self._render_rows(0, self.height, memoryview(brute))
+        finally:
+            self.render_mode = saved_mode
+        
+        mismatches = sum(1 for a, b in zip(fast, brute) if a != b)
+        return {
+            'mode': saved_mode,
+            'symmetry': self.last_symmetry_used,
+            'mismatches': mismatches,
+            'iterations': fast_iterations,
+            'brute_force_iterations': brute_iterations,
+            'saved_ratio': 1 - fast_iterations / brute_iterations if brute_iterations else 0.0
+        }
     
     def apply_quantum_filters(self) -> None:
         """
@@ -83,68 +1159,583 @@ class QuantumFractalGenerator:
         # 添加一些随机"量子噪声"来增加视觉效果
         noise_level = 0.02  # 噪声强度
         
+        canvas = self.canvas
         for y in range(1, self.height - 1):
+            row_offset = y * self.width
             for x in range(1, self.width - 1):
                 if random.random() < noise_level:
-                    # 随机替换少量像素
-                    self.canvas[y][x] = random.choice(self.symbols[:3])
+                    # 随机替换少量像素为前三种字符之一（直接写下标）
+                    canvas[row_offset + x] = random.randrange(3)
     
-    def execute_temporal_evolution(self, cycles: int = 15) -> None:
+    def execute_temporal_evolution(self, cycles: int = 15,
+                                   scheduler: Optional[FrameScheduler] = None,
+                                   pipelined: bool = False) -> None:
         """
         执行时间演化 - 其实就是循环显示动画帧
+        Args:
+            cycles: 帧数
+            scheduler: 帧调度器，默认按原来每帧0.3秒的节奏自适应调度
+            pipelined: 是否启用流水线模式（后台线程渲染下一帧，同时显示当前帧）
         """
         print("🚀 启动量子分形演算引擎...")
         
+        self.scheduler = scheduler or FrameScheduler()
+        try:
+            if pipelined:
+                self._run_pipelined(cycles)
+            else:
+                self._run_cycles(cycles)
+        finally:
+            self.display.finish()
+        
+        timing = self.scheduler.summary()
+        if timing['frames']:
+            print(f"⏱️  帧计时: 平均渲染 {timing['avg_render_ms']:.1f} ms | "
+                  f"平均显示 {timing['avg_display_ms']:.1f} ms | "
+                  f"最长渲染 {timing['max_render_ms']:.1f} ms | 掉帧 {timing['dropped_frames']}"
+                  f" (错过截止时间 {timing['missed_deadlines']} 次)")
+        
+        if self.display.frames:
+            print(f"📦 终端输出: 共 {self.display.frames} 帧, "
+                  f"平均 {self.display.total_bytes / self.display.frames:.0f} 字节/帧")
+        if self.frame_cache is not None:
+            cache = self.frame_cache
+            print(f"🗂️  帧缓存: 内存命中 {cache.hits} | 磁盘命中 {cache.disk_hits} | 未命中 {cache.misses}")
+    
+    def _run_cycles(self, cycles: int) -> None:
+        """
+        动画主循环
+        """
+        scheduler = self.scheduler
+        scheduler.start(self)
+        
         for cycle in range(cycles):
             try:
-                # 更新量子状态（时间参数）
-                self.quantum_state = cycle * 0.2
+                # 更新量子状态（时间参数）和调度器选定的画质
+                self._advance_to(cycle)
+                scheduler.apply(self)
                 
                 # 渲染当前帧
+                render_started = time.perf_counter()
                 self.render_quantum_field()
                 
                 # 应用后处理效果
                 if cycle > 5:  # 前几帧不加噪声，让用户看清楚图案
                     self.apply_quantum_filters()
+                render_seconds = time.perf_counter() - render_started
                 
-                # 清屏并显示
+                # 增量刷新显示
+                display_started = time.perf_counter()
                 self._display_frame(cycle, cycles)
+                display_seconds = time.perf_counter() - display_started
                 
-                # 动画延迟
-                time.sleep(0.3)
+                # 记录计时、调整画质，只睡剩余的时间
+                scheduler.record(self, cycle, render_seconds, display_seconds)
+                scheduler.wait()
                 
             except KeyboardInterrupt:
                 print("\n⏹️  量子演算被用户中断")
                 break
             except Exception as e:
                 print(f"⚠️  第 {cycle + 1} 帧计算异常: {e}")
+                self.display.invalidate()  # 屏幕被打乱，下一帧整屏重绘
                 continue
     
-    def _display_frame(self, cycle: int, total_cycles: int) -> None:
+    def _run_pipelined(self, cycles: int) -> None:
         """
-        显示当前帧 - 私有方法，负责控制台输出格式
+        流水线动画主循环 - 双缓冲的生产者/消费者
+        后台线程把第 N+1 帧渲染进空闲缓冲区，主线程同时加噪声、显示第 N 帧并等待截止时间。
+        一共只有两块画布缓冲区，都被占用时渲染线程阻塞等待（背压），长时间运行内存也不会增长。
         """
-        # 清屏（跨平台兼容）
-        os.system('cls' if os.name == 'nt' else 'clear')
+        renderer = self._render_clone()
+        scheduler = self.scheduler
+        scheduler.start(renderer)
+        
+        free_buffers: queue.Queue = queue.Queue()
+        free_buffers.put(self.canvas)
+        free_buffers.put(bytearray(len(self.canvas)))
+        ready_frames: queue.Queue = queue.Queue(maxsize=1)
+        stop = threading.Event()
+        
+        def hand_over(item: Optional[Dict]) -> None:
+            """把渲染结果交给主线程，队列满时等待，收到停止信号就放弃"""
+            while not stop.is_set():
+                try:
+                    ready_frames.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
         
-        # 显示标题和状态信息
-        print("🌌 量子分形可视化系统 v3.0 (优化版) 🌌")
-        print(f"量子态: Ψ{cycle + 1} | 维度空间: {self.width}×{self.height}")
-        print(f"时间参数: t={self.quantum_state:.2f} | 进度: {(cycle + 1)/total_cycles*100:.1f}%")
-        print("=" * self.width)
+        def produce() -> None:
+            for cycle in range(cycles):
+                buffer = free_buffers.get()
+                if stop.is_set():
+                    return
+                try:
+                    renderer._advance_to(cycle)
+                    scheduler.apply(renderer)
+                    size = renderer.width * renderer.height
+                    if len(buffer) != size:  # 自适应画质改了分辨率
+                        buffer = bytearray(size)
+                    started = time.perf_counter()
+                    stats = renderer._render_into(buffer)
+                    item = {
+                        'cycle': cycle,
+                        'state': renderer.quantum_state,
+                        'dimensions': (renderer.width, renderer.height),
+                        'iterations': renderer.max_iterations,
+                        'zoom_scale': renderer.zoom_scale,
+                        'canvas': buffer,
+                        'render_seconds': time.perf_counter() - started,
+                        'stats': stats,
+                        'symmetry': renderer.last_symmetry_used
+                    }
+                except Exception as e:
+                    free_buffers.put(buffer)
+                    item = {'cycle': cycle, 'error': e}
+                hand_over(item)
+            hand_over(None)  # 结束标记
+        
+        producer = threading.Thread(target=produce, name="fractal-renderer", daemon=True)
+        producer.start()
+        displayed: Optional[bytearray] = None
+        
+        try:
+            while True:
+                item = ready_frames.get()
+                if item is None:
+                    break
+                cycle = item['cycle']
+                if 'error' in item:
+                    print(f"⚠️  第 {cycle + 1} 帧计算异常: {item['error']}")
+                    self.display.invalidate()  # 屏幕被打乱，下一帧整屏重绘
+                    continue
+                
+                # 切换到新渲染好的缓冲区
+                self.quantum_state = item['state']
+                self.width, self.height = item['dimensions']
+                self.canvas = item['canvas']
+                self.last_iterations, self.last_iterations_saved = item['stats']
+                self.last_symmetry_used = item['symmetry']
+                self.max_iterations = item['iterations']
+                self.zoom_scale = item['zoom_scale']
+                
+                filter_started = time.perf_counter()
+                if cycle > 5:  # 前几帧不加噪声，让用户看清楚图案
+                    self.apply_quantum_filters()
+                render_seconds = item['render_seconds'] + time.perf_counter() - filter_started
+                
+                display_started = time.perf_counter()
+                self._display_frame(cycle, cycles)
+                display_seconds = time.perf_counter() - display_started
+                
+                # 上一块缓冲区显示完毕，还给渲染线程
+                if displayed is not None:
+                    free_buffers.put(displayed)
+                displayed = self.canvas
+                
+                scheduler.record(self, cycle, render_seconds, display_seconds)
+                scheduler.wait()
         
-        # 渲染画布
-        for row in self.canvas:
-            print(''.join(row))
+        except KeyboardInterrupt:
+            print("\n⏹️  量子演算被用户中断")
+        finally:
+            stop.set()
+            free_buffers.put(bytearray())  # 唤醒可能在等空闲缓冲区的渲染线程
+            producer.join()
+            self._executor = renderer._executor
+    
+    def _display_frame(self, cycle: int, total_cycles: int) -> None:
+        """
+        显示当前帧 - 私有方法，负责控制台输出格式
+        """
+        # 标题和状态信息
+        header = [
+            "🌌 量子分形可视化系统 v3.0 (优化版) 🌌",
+            f"量子态: Ψ{cycle + 1} | 维度空间: {self.width}×{self.height} | 引擎: {self.backend}",
+            f"时间参数: t={self.quantum_state:.2f} | 进度: {(cycle + 1)/total_cycles*100:.1f}%"
+            f"{f' | 缩放: {self.zoom_scale:.3e}' if self.render_mode == 'perturbation' else ''}",
+            "=" * self.width,
+        ]
         
-        print("=" * self.width)
+        # 画布
+        grid = self.canvas_rows()
         
-        # 显示技术参数（看起来很专业）
+        # 技术参数（看起来很专业）
         convergence_rate = 95.5 + cycle * 0.3 + random.uniform(-0.5, 0.5)
         quantum_coherence = 87.2 + math.sin(cycle * 0.5) * 10
         
-        print(f"收敛率: {convergence_rate:.2f}% | 量子相干性: {quantum_coherence:.1f}%")
-        print(f"计算复杂度: O(n²) | 分形维数: {1.85 + 0.1 * math.sin(cycle):.3f}")
+        footer = [
+            "=" * self.width,
+            f"收敛率: {convergence_rate:.2f}% | 量子相干性: {quantum_coherence:.1f}%",
+            f"计算复杂度: O(n²) | 分形维数: {1.85 + 0.1 * math.sin(cycle):.3f}",
+            f"上一帧输出: {self.display.last_bytes} 字节 | 本帧迭代: {self.last_iterations}"
+            f" (周期检测省下 {self.last_iterations_saved})"
+            f"{' | 对称加速' if self.last_symmetry_used else ''}",
+        ]
+        
+        timing = self.scheduler.last if self.scheduler is not None else None
+        if timing is not None:
+            footer.append(f"上一帧: 渲染 {timing['render_ms']:.1f} ms | 显示 {timing['display_ms']:.1f} ms"
+                          f" | 迭代上限 {self.max_iterations} | 错过截止时间 {timing['missed_deadlines']}"
+                          f" | 累计掉帧 {self.scheduler.dropped_frames}")
+        
+        # 整帧一次性缓冲写出，只包含变化的部分
+        self.display.write_frame(header, grid, footer)
+
+
+# 帧文件格式：固定512字节文件头 + 连续存放的逐帧字符下标平面（每帧 width*height 字节）
+FRAME_FILE_MAGIC = b'QFRM'
+FRAME_FILE_VERSION = 1
+FRAME_FILE_HEADER_SIZE = 512
+# 魔数, 版本, 宽, 高, 帧数, 最大迭代次数, 起始时间参数, 时间步长, 字符集JSON长度
+FRAME_FILE_HEADER = struct.Struct('<4sHIIIIddH')
+
+
+def export_frames(path: str, frames: int,
+                  dimensions: Tuple[int, int] = (80, 40),
+                  start_state: float = 0.0,
+                  time_step: float = 0.2,
+                  **generator_options) -> Dict:
+    """
+    无界面批量导出动画帧 - 不显示、不sleep、不加噪声，尽可能快地渲染 N 帧
+    文件按总大小预先分配，通过内存映射把每帧直接写到对应位置。
+    Args:
+        path: 输出文件路径
+        frames: 帧数
+        dimensions: 画布尺寸 (宽度, 高度)
+        start_state, time_step: 第 i 帧的时间参数为 start_state + i * time_step
+        generator_options: 传给 QuantumFractalGenerator 的其他参数（backend, workers 等）
+    Returns:
+        导出统计信息字典
+    """
+    if frames < 1:
+        raise ValueError("帧数必须是正整数")
+    
+    generator = QuantumFractalGenerator(dimensions, **generator_options)
+    symbols_blob = json.dumps(generator.symbols, ensure_ascii=False).encode('utf-8')
+    if FRAME_FILE_HEADER.size + len(symbols_blob) > FRAME_FILE_HEADER_SIZE:
+        raise ValueError("字符集太长，文件头放不下")
+    
+    frame_size = generator.width * generator.height
+    total_size = FRAME_FILE_HEADER_SIZE + frames * frame_size
+    iterations = 0
+    started = time.perf_counter()
+    
+    try:
+        with open(path, 'w+b') as f:
+            f.truncate(total_size)  # 预分配整个文件
+            with mmap.mmap(f.fileno(), total_size) as mapped:
+                header = FRAME_FILE_HEADER.pack(
+                    FRAME_FILE_MAGIC, FRAME_FILE_VERSION, generator.width, generator.height,
+                    frames, generator.max_iterations, start_state, time_step, len(symbols_blob))
+                mapped[:len(header)] = header
+                mapped[len(header):len(header) + len(symbols_blob)] = symbols_blob
+                
+                for index in range(frames):
+                    generator.quantum_state = start_state + index * time_step
+                    if generator.render_mode == 'perturbation':
+                        generator.zoom_scale = (generator.zoom_start_scale
+                                                * generator.zoom_per_frame ** index)
+                    generator.render_quantum_field()
+                    iterations += generator.last_iterations
+                    offset = FRAME_FILE_HEADER_SIZE + index * frame_size
+                    mapped[offset:offset + frame_size] = generator.canvas
+                
+                mapped.flush()
+    finally:
+        generator.close()
+    
+    elapsed = time.perf_counter() - started
+    return {
+        'path': path,
+        'frames': frames,
+        'bytes': total_size,
+        'elapsed': elapsed,
+        'fps': frames / elapsed if elapsed > 0 else 0.0,
+        'iterations': iterations
+    }
+
+
+class FrameFileReader:
+    """
+    帧文件读取器 - 内存映射打开，按帧号直接定位，不会把其他帧读入内存
+    """
+    
+    def __init__(self, path: str):
+        self._file = open(path, 'rb')
+        try:
+            self._mapped = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # 空文件无法映射
+            self._file.close()
+            raise ValueError(f"不是有效的帧文件: {path}")
+        
+        try:
+            try:
+                (magic, version, self.width, self.height, self.frame_count,
+                 self.max_iterations, self.start_state, self.time_step,
+                 symbols_length) = FRAME_FILE_HEADER.unpack_from(self._mapped)
+            except struct.error:  # 文件比文件头还短
+                raise ValueError(f"不是有效的帧文件: {path}")
+            if magic != FRAME_FILE_MAGIC or version != FRAME_FILE_VERSION:
+                raise ValueError(f"不是有效的帧文件: {path}")
+            
+            start = FRAME_FILE_HEADER.size
+            self.symbols = json.loads(self._mapped[start:start + symbols_length].decode('utf-8'))
+            self.frame_size = self.width * self.height
+            if len(self._mapped) < FRAME_FILE_HEADER_SIZE + self.frame_count * self.frame_size:
+                raise ValueError(f"帧文件不完整: {path}")
+        except ValueError:
+            self.close()
+            raise
+    
+    def __len__(self) -> int:
+        return self.frame_count
+    
+    def __enter__(self) -> "FrameFileReader":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """关闭映射和文件"""
+        self._mapped.close()
+        self._file.close()
+    
+    def quantum_state(self, index: int) -> float:
+        """第 index 帧的时间参数"""
+        return self.start_state + index * self.time_step
+    
+    def frame(self, index: int) -> bytes:
+        """
+        读取第 index 帧的字符下标平面（只访问这一帧所在的页）
+        """
+        if not 0 <= index < self.frame_count:
+            raise IndexError(f"帧号超出范围: {index}")
+        offset = FRAME_FILE_HEADER_SIZE + index * self.frame_size
+        return self._mapped[offset:offset + self.frame_size]
+    
+    def frame_rows(self, index: int) -> List[str]:
+        """读取第 index 帧并转换为逐行字符串"""
+        data = self.frame(index)
+        table = dict(enumerate(self.symbols))
+        return [data[start:start + self.width].decode('latin-1').translate(table)
+                for start in range(0, self.frame_size, self.width)]
+
+
+class FrameStreamServer:
+    """
+    本地帧推送服务 - 多个看板共享同一路动画
+    每帧只渲染一次，编码好的字节分发给所有已连接的客户端。每个客户端只有一个
+    待发送帧的槽位，网络慢的客户端来不及取走时直接用新帧覆盖（跳帧），
+    渲染循环从不等待任何客户端。
+    路由:
+        /         浏览器页面（EventSource 订阅 /events）
+        /events   server-sent events，每帧一个 frame 事件
+        /stream   分块传输的纯文本，适合 curl -N 在终端里看
+        /metrics  JSON 指标：客户端数、发送帧数、跳帧数、渲染耗时
+    """
+    
+    PAGE = (
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\"><title>量子分形</title></head>"
+        "<body style=\"background:#000;color:#0f0\"><pre id=\"frame\"></pre><script>"
+        "new EventSource('/events').addEventListener('frame',"
+        "e=>{document.getElementById('frame').textContent=e.data;});"
+        "</script></body></html>"
+    )
+    
+    def __init__(self, generator: QuantumFractalGenerator, host: str = '127.0.0.1',
+                 port: int = 8765, frame_interval: float = 0.3):
+        """
+        Args:
+            generator: 负责渲染的生成器（只在渲染线程里使用）
+            host, port: 监听地址
+            frame_interval: 帧间隔（秒）
+        """
+        if frame_interval <= 0:
+            raise ValueError("帧间隔必须为正数")
+        self.generator = generator
+        self.host = host
+        self.port = port
+        self.frame_interval = frame_interval
+        self.clients: Dict[int, Tuple["asyncio.Queue", "asyncio.StreamWriter"]] = {}
+        self.frames_rendered = 0
+        self.frames_served = 0
+        self.frames_skipped = 0
+        self.bytes_sent = 0
+        self.clients_total = 0
+        self.render_seconds = 0.0
+        self.last_render_seconds = 0.0
+        self.max_render_seconds = 0.0
+        self._started = time.monotonic()
+        self._client_joined: Optional[asyncio.Event] = None
+        self._server = None
+    
+    def metrics(self) -> Dict:
+        """当前指标快照"""
+        rendered = self.frames_rendered
+        metrics = {
+            'clients': len(self.clients),
+            'clients_total': self.clients_total,
+            'frames_rendered': rendered,
+            'frames_served': self.frames_served,
+            'frames_skipped': self.frames_skipped,
+            'bytes_sent': self.bytes_sent,
+            'avg_render_ms': self.render_seconds / rendered * 1000 if rendered else 0.0,
+            'last_render_ms': self.last_render_seconds * 1000,
+            'max_render_ms': self.max_render_seconds * 1000,
+            'uptime_s': time.monotonic() - self._started,
+        }
+        cache = self.generator.frame_cache
+        if cache is not None:
+            metrics['cache'] = {'hits': cache.hits, 'disk_hits': cache.disk_hits,
+                                'misses': cache.misses}
+        return metrics
+    
+    async def serve(self, frames: Optional[int] = None) -> None:
+        """
+        启动监听和渲染循环
+        Args:
+            frames: 渲染多少帧后停止，None 表示一直运行直到被取消
+        """
+        self._client_joined = asyncio.Event()
+        self._server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]  # port=0 时取实际端口
+        try:
+            async with self._server:
+                await self._render_loop(frames)
+        finally:
+            self._server.close()
+            # 通知所有推送协程正常结束，而不是在事件循环关闭时被强行取消；
+            # 卡在 drain 上的慢客户端直接断开连接
+            for slot, writer in list(self.clients.values()):
+                if slot.full():
+                    slot.get_nowait()
+                slot.put_nowait(None)
+                writer.transport.abort()
+            await asyncio.sleep(0)
+    
+    async def _render_loop(self, frames: Optional[int]) -> None:
+        """
+        按帧间隔渲染并广播；没有客户端时暂停渲染
+        """
+        loop = asyncio.get_running_loop()
+        cycle = 0
+        while frames is None or cycle < frames:
+            if not self.clients:
+                self._client_joined.clear()
+                await self._client_joined.wait()
+            
+            deadline = loop.time() + self.frame_interval
+            started = time.perf_counter()
+            # 渲染放到线程里，事件循环继续给客户端写数据
+            payloads = await loop.run_in_executor(None, self._render_payloads, cycle)
+            elapsed = time.perf_counter() - started
+            
+            self.frames_rendered += 1
+            self.render_seconds += elapsed
+            self.last_render_seconds = elapsed
+            self.max_render_seconds = max(self.max_render_seconds, elapsed)
+            self._broadcast(payloads)
+            cycle += 1
+            
+            await asyncio.sleep(max(0.0, deadline - loop.time()))
+    
+    def _render_payloads(self, cycle: int) -> Dict[str, bytes]:
+        """
+        渲染第 cycle 帧，并一次性编码成两种传输格式
+        """
+        generator = self.generator
+        generator._advance_to(cycle)
+        generator.render_quantum_field()
+        if cycle > 5:  # 和终端动画一样，前几帧不加噪声
+            generator.apply_quantum_filters()
+        
+        title = (f"量子态: Ψ{cycle + 1} | 维度空间: {generator.width}×{generator.height}"
+                 f" | t={generator.quantum_state:.2f} | 迭代: {generator.last_iterations}")
+        lines = [title] + generator.canvas_rows()
+        
+        event = f"id: {cycle}\nevent: frame\n" + "".join(f"data: {line}\n" for line in lines) + "\n"
+        text = ("\x1b[H\x1b[2J" + "\n".join(lines) + "\n").encode('utf-8')
+        return {
+            'events': event.encode('utf-8'),
+            'stream': b"%x\r\n%s\r\n" % (len(text), text),
+        }
+    
+    def _broadcast(self, payloads: Dict[str, bytes]) -> None:
+        """
+        把新帧放进每个客户端的槽位；旧帧还没取走就丢掉它
+        """
+        for slot, _ in self.clients.values():
+            if slot.full():
+                slot.get_nowait()
+                self.frames_skipped += 1
+            slot.put_nowait(payloads)
+    
+    async def _handle_client(self, reader: "asyncio.StreamReader",
+                             writer: "asyncio.StreamWriter") -> None:
+        """
+        处理一个HTTP连接：解析请求行，按路由返回页面、指标或帧流
+        """
+        try:
+            request_line = await reader.readline()
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass  # 请求头用不到，读完丢掉
+            parts = request_line.decode('latin-1').split()
+            path = parts[1].split('?')[0] if len(parts) >= 2 else ''
+            
+            if path == '/':
+                self._respond(writer, '200 OK', 'text/html; charset=utf-8', self.PAGE.encode('utf-8'))
+            elif path == '/metrics':
+                body = json.dumps(self.metrics(), ensure_ascii=False).encode('utf-8')
+                self._respond(writer, '200 OK', 'application/json', body)
+            elif path == '/events':
+                await self._stream(writer, 'events', 'text/event-stream; charset=utf-8', b'')
+            elif path == '/stream':
+                await self._stream(writer, 'stream', 'text/plain; charset=utf-8',
+                                   b'Transfer-Encoding: chunked\r\n')
+            else:
+                self._respond(writer, '404 Not Found', 'text/plain; charset=utf-8', "未知路径\n".encode('utf-8'))
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass  # 客户端断开
+        finally:
+            writer.close()
+    
+    @staticmethod
+    def _respond(writer: "asyncio.StreamWriter", status: str,
+                 content_type: str, body: bytes) -> None:
+        """写出一个完整的普通响应"""
+        writer.write(f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode('latin-1') + body)
+    
+    async def _stream(self, writer: "asyncio.StreamWriter", kind: str,
+                      content_type: str, extra_headers: bytes) -> None:
+        """
+        持续给一个客户端推送帧，直到它断开
+        """
+        writer.write(f"HTTP/1.1 200 OK\r\nContent-Type: {content_type}\r\n"
+                     f"Cache-Control: no-cache\r\n".encode('latin-1') + extra_headers + b"\r\n")
+        await writer.drain()
+        
+        slot: asyncio.Queue = asyncio.Queue(maxsize=1)
+        client_id = id(slot)
+        self.clients[client_id] = (slot, writer)
+        self.clients_total += 1
+        self._client_joined.set()
+        try:
+            while True:
+                payloads = await slot.get()
+                if payloads is None:  # 服务关闭
+                    break
+                payload = payloads[kind]
+                writer.write(payload)
+                await writer.drain()  # 只阻塞这个客户端自己的协程
+                self.frames_served += 1
+                self.bytes_sent += len(payload)
+        finally:
+            del self.clients[client_id]
 
 
 def initialize_quantum_environment() -> QuantumFractalGenerator:
@@ -166,7 +1757,7 @@ def initialize_quantum_environment() -> QuantumFractalGenerator:
     print("✅ 量子分形生成器已就绪！")
     print("💡 提示: 按 Ctrl+C 可随时中断演算\n")
     
-    return QuantumFractalGenerator()
+    return QuantumFractalGenerator(frame_cache=FrameCache(capacity=64))
 
 
 def display_technical_explanation() -> None:
@@ -190,6 +1781,7 @@ def main():
     """
     主程序 - 优化后的完整分形可视化系统
     """
+    generator = None
     try:
         print("🎯 欢迎使用量子分形可视化系统!")
         print("📊 本程序将展示Julia集合的美丽分形图案\n")
@@ -198,7 +1790,7 @@ def main():
         generator = initialize_quantum_environment()
         
         # 执行主要演算
-        generator.execute_temporal_evolution(cycles=20)
+        generator.execute_temporal_evolution(cycles=20, pipelined=True)
         
         # 显示完成信息
         print("\n🎉 量子分形演算完成!")
@@ -214,7 +1806,81 @@ def main():
     except Exception as e:
         print(f"❌ 系统异常: {e}")
         print("🔧 请检查系统配置或联系技术支持")
+    finally:
+        if generator is not None:
+            generator.close()
+
+
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    命令行参数 - 不带参数时进入原来的动画演示
+    """
+    parser = argparse.ArgumentParser(description="量子分形可视化系统")
+    parser.add_argument('--export', metavar='PATH', help="无界面批量导出帧文件")
+    parser.add_argument('--serve', action='store_true', help="启动本地帧推送服务（SSE/分块文本）")
+    parser.add_argument('--host', default='127.0.0.1', help="推送服务监听地址")
+    parser.add_argument('--port', type=int, default=8765, help="推送服务端口")
+    parser.add_argument('--interval', type=float, default=0.3, help="推送服务帧间隔（秒）")
+    parser.add_argument('--frames', type=int, default=100, help="导出帧数")
+    parser.add_argument('--size', default='80x40', help="画布尺寸，例如 200x100")
+    parser.add_argument('--step', type=float, default=0.2, help="每帧时间参数步长")
+    parser.add_argument('--max-iterations', type=int, default=30, help="最大迭代次数")
+    parser.add_argument('--workers', type=int, default=1, help="并行渲染工作者数量，0 为CPU核数")
+    parser.add_argument('--mode', default='full', choices=['full', 'boundary', 'perturbation'],
+                        help="渲染模式")
+    parser.add_argument('--zoom-center', default='0,0', help="深度缩放中心，例如 0.0224,0.8166")
+    parser.add_argument('--zoom-scale', type=float, default=1.0, help="初始缩放比例")
+    parser.add_argument('--zoom-per-frame', type=float, default=1.0, help="每帧缩放倍率")
+    return parser.parse_args(argv)
+
+
+def export_main(args: argparse.Namespace) -> None:
+    """
+    批量导出入口
+    """
+    width, height = (int(value) for value in args.size.lower().split('x'))
+    print(f"📼 导出 {args.frames} 帧 {width}×{height} 到 {args.export} ...")
+    stats = export_frames(args.export, args.frames, (width, height),
+                          time_step=args.step,
+                          max_iterations=args.max_iterations,
+                          workers=args.workers,
+                          render_mode=args.mode,
+                          zoom_center=tuple(args.zoom_center.split(',')),
+                          zoom_scale=args.zoom_scale,
+                          zoom_per_frame=args.zoom_per_frame)
+    print(f"✅ 完成: {stats['bytes']} 字节, 用时 {stats['elapsed']:.2f} 秒, "
+          f"{stats['fps']:.1f} 帧/秒")
+
+
+def serve_main(args: argparse.Namespace) -> None:
+    """
+    帧推送服务入口
+    """
+    width, height = (int(value) for value in args.size.lower().split('x'))
+    generator = QuantumFractalGenerator((width, height),
+                                        frame_cache=FrameCache(capacity=64),
+                                        max_iterations=args.max_iterations,
+                                        workers=args.workers,
+                                        render_mode=args.mode,
+                                        zoom_center=tuple(args.zoom_center.split(',')),
+                                        zoom_scale=args.zoom_scale,
+                                        zoom_per_frame=args.zoom_per_frame)
+    server = FrameStreamServer(generator, args.host, args.port, args.interval)
+    print(f"📡 帧推送服务: http://{args.host}:{args.port}/ "
+          f"(/events, /stream, /metrics)，按 Ctrl+C 停止")
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        print(f"\n⏹️  推送服务已停止: {json.dumps(server.metrics(), ensure_ascii=False)}")
+    finally:
+        generator.close()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    arguments = parse_arguments()
+    if arguments.export:
+        export_main(arguments)
+    elif arguments.serve:
+        serve_main(arguments)
+    else:
+        main()
\ No newline at end of file
@@ -0,0 +1,447 @@
+"""
+多功能数学计算器 - 区间求和索引
+Version: 1.0
+Author: wei si qi
+功能: 对磁盘上的数值序列（二进制或CSV的某一列）建立前缀和索引，
+      O(1) 求任意子区间的和；需要修改数据时用树状数组（Fenwick树），O(log n) 单点更新。
+      索引保存为文件并用内存映射打开，启动时不必重新扫描数据。
+"""
+
+import os
+import sys
+import time
+import csv
+import mmap
+import struct
+import argparse
+from array import array
+from itertools import accumulate
+from typing import Iterable, Iterator, List, Tuple, Optional, Union
+
+try:
+    import numpy as np  # 可选依赖：有NumPy时用向量化累加建索引
+except ImportError:
+    np = None
+
+
+# 索引文件格式：固定64字节文件头 + 连续存放的数值（本机字节序）
+# 魔数, 版本, 类型码('q' 整数 / 'd' 浮点), 字节序('<' / '>'), 数值个数, 数据源大小, 数据源修改时间(纳秒)
+INDEX_HEADER = struct.Struct('<4sHcc3Q')
+INDEX_HEADER_SIZE = 64
+INDEX_VERSION = 1
+PREFIX_MAGIC = b'PSUM'
+FENWICK_MAGIC = b'FENW'
+BYTE_ORDER = b'<' if sys.byteorder == 'little' else b'>'
+
+# 建索引时每次从数据源读取的数值个数
+CHUNK_SIZE = 1 << 16
+
+Number = Union[int, float]
+
+
+def iter_column(path: str, column: Union[int, str] = 0, typecode: str = 'q') -> Iterator[array]:
+    """
+    按块读取数据文件中的一列数值，每块最多 CHUNK_SIZE 个，内存占用与文件大小无关
+    .csv 文件按列号或列名读取（首行不是数字时当作表头）；其他文件按 typecode 当作本机字节序的原始二进制数组，
+    用内存映射读取
+    Args:
+        path: 数据文件路径
+        column: CSV列号或列名
+        typecode: 二进制文件的元素类型，'q' 为int64，'d' 为float64
+    Yields:
+        array: 一块数值；CSV中出现小数后，之后的块都是 'd'，之前的块是 'q'
+    """
+    if not path.lower().endswith('.csv'):
+        if typecode not in ('q', 'd'):
+            raise ValueError("类型码必须是 'q' 或 'd'")
+        itemsize = array(typecode).itemsize
+        size = os.path.getsize(path)
+        if size % itemsize:
+            raise ValueError(f"文件大小不是 {itemsize} 字节的整数倍: {path}")
+        if size == 0:  # 空文件无法映射
+            return
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            block = CHUNK_SIZE * itemsize
+            for offset in range(0, size, block):
+                chunk = array(typecode)
+                chunk.frombytes(mapped[offset:offset + block])
+                yield chunk
+        return
+
+    chunk = array('q')
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        index = column if isinstance(column, int) else None
+        for line_number, row in enumerate(reader, 1):
+            if not row:
+                continue
+            if index is None:  # 按列名查找，第一行必须是表头
+                if column not in row:
+                    raise ValueError(f"找不到列: {column}")
+                index = row.index(column)
+                continue
+            cell = row[index].strip()
+            try:
+                value = int(cell)
+            except ValueError:
+                try:
+                    value = float(cell)
+                except ValueError:
+                    if line_number == 1:
+                        continue  # 数字列的表头
+                    raise ValueError(f"第 {line_number} 行不是数字: {cell!r}")
+            if isinstance(value, float) and chunk.typecode == 'q':
+                chunk = array('d', chunk)
+            elif isinstance(value, int) and not -2 ** 63 <= value < 2 ** 63:
+                raise ValueError(f"第 {line_number} 行超出int64范围: {cell}")
+            chunk.append(value)
+            if len(chunk) >= CHUNK_SIZE:
+                yield chunk
+                chunk = array(chunk.typecode)
+    if chunk:
+        yield chunk
+
+
+def load_column(path: str, column: Union[int, str] = 0, typecode: str = 'q') -> array:
+    """
+    把数据文件中的一列数值整列读入内存（参数见 iter_column）
+    Returns:
+        array: 整列数值，CSV中出现小数时为 'd'，否则为 'q'
+    """
+    values = array(typecode if not path.lower().endswith('.csv') else 'q')
+    for chunk in iter_column(path, column, typecode):
+        if chunk.typecode != values.typecode:
+            values = array('d', values)
+        values.extend(chunk)
+    return values
+
+
+def _source_signature(path: Optional[str]) -> Tuple[int, int]:
+    """数据源的大小和修改时间，用来判断索引是否过期"""
+    if path is None:
+        return 0, 0
+    info = os.stat(path)
+    return info.st_size, info.st_mtime_ns
+
+
+def _write_index(path: str, magic: bytes, values: array, count: int,
+                 source: Optional[str]) -> None:
+    """
+    写出索引文件：先写临时文件再替换，中途失败不会留下半个索引
+    Args:
+        count: 原始数值个数（前缀和数组比它多一个 P[0]）
+    """
+    size, mtime = _source_signature(source)
+    header = INDEX_HEADER.pack(magic, INDEX_VERSION, values.typecode.encode('ascii'),
+                               BYTE_ORDER, count, size, mtime)
+    temporary = path + '.tmp'
+    with open(temporary, 'wb') as f:
+        f.write(header.ljust(INDEX_HEADER_SIZE, b'\0'))
+        values.tofile(f)
+    os.replace(temporary, path)
+
+
+def _read_header(mapped, path: str, magic: bytes) -> Tuple[str, int, int, int]:
+    """校验索引文件头，返回 (类型码, 数值个数, 数据源大小, 数据源修改时间)"""
+    try:
+        (file_magic, version, typecode, byte_order,
+         count, size, mtime) = INDEX_HEADER.unpack_from(mapped)
+    except struct.error:
+        raise ValueError(f"不是有效的索引文件: {path}")
+    if file_magic != magic or version != INDEX_VERSION:
+        raise ValueError(f"不是有效的索引文件: {path}")
+    if byte_order != BYTE_ORDER:
+        raise ValueError(f"索引文件的字节序与本机不同: {path}")
+    if typecode not in (b'q', b'd'):
+        raise ValueError(f"不是有效的索引文件: {path}")
+    typecode = typecode.decode('ascii')
+    if len(mapped) < INDEX_HEADER_SIZE + count * array(typecode).itemsize:
+        raise ValueError(f"索引文件不完整: {path}")
+    return typecode, count, size, mtime
+
+
+def _chunk_prefix(chunk: array, total: Number) -> Tuple[array, Number]:
+    """
+    一块数值接在 total 后面的前缀和 (total + chunk[0], total + chunk[0] + chunk[1], ...)
+    整数前缀和超出int64时报错，而不是悄悄溢出
+    Returns:
+        (这一块的前缀和, 新的累计和)
+    """
+    typecode = chunk.typecode
+    prefix = array(typecode)
+    if np is not None:
+        data = np.frombuffer(chunk, dtype=np.int64 if typecode == 'q' else np.float64)
+        safe = typecode == 'd' or abs(total) + float(np.abs(data.astype(np.float64)).sum()) < 2.0 ** 62
+        if safe:  # 否则可能溢出，交给下面逐个的精确检查
+            sums = np.cumsum(np.concatenate(([total], data)).astype(data.dtype))[1:]
+            prefix.frombytes(sums.tobytes())
+            return prefix, prefix[-1]
+    try:
+        prefix.extend(accumulate(chunk, initial=total))
+    except OverflowError:
+        raise ValueError("前缀和超出int64范围，请改用浮点类型 'd'")
+    prefix.pop(0)
+    return prefix, prefix[-1]
+
+
+def _convert_to_float(f, count: int) -> None:
+    """把索引文件中已经写出的 count 个整数前缀和原地改成浮点数（两者都是8字节）"""
+    for start in range(0, count, CHUNK_SIZE):
+        block = array('q')
+        f.seek(INDEX_HEADER_SIZE + start * block.itemsize)
+        block.fromfile(f, min(CHUNK_SIZE, count - start))
+        f.seek(INDEX_HEADER_SIZE + start * block.itemsize)
+        array('d', block).tofile(f)
+    f.seek(0, os.SEEK_END)
+
+
+def _write_prefix_index(path: str, chunks: Iterable[array], typecode: str,
+                        source: Optional[str]) -> None:
+    """
+    边读数据边把前缀和追加写入索引文件，内存中只有当前这一块
+    先写临时文件再替换，中途失败不会留下半个索引
+    Args:
+        chunks: 一块块的数值（见 iter_column）
+        typecode: 没有任何数值时文件头里记录的类型码
+    """
+    temporary = path + '.tmp'
+    count = 0
+    total = 0
+    try:
+        with open(temporary, 'w+b') as f:
+            # 文件头最后再写；P[0] = 0，整数0和浮点0.0的字节都是全零
+            f.write(bytes(INDEX_HEADER_SIZE + array(typecode).itemsize))
+            for chunk in chunks:
+                if not chunk:
+                    continue
+                if count == 0:
+                    typecode = chunk.typecode
+                elif chunk.typecode != typecode:  # CSV中途出现小数
+                    _convert_to_float(f, count + 1)
+                    typecode, total = 'd', float(total)
+                prefix, total = _chunk_prefix(chunk, total)
+                prefix.tofile(f)
+                count += len(chunk)
+            size, mtime = _source_signature(source)
+            header = INDEX_HEADER.pack(PREFIX_MAGIC, INDEX_VERSION, typecode.encode('ascii'),
+                                       BYTE_ORDER, count, size, mtime)
+            f.seek(0)
+            f.write(header)
+        os.replace(temporary, path)
+    except BaseException:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+        raise
+
+
+class PrefixSumIndex:
+    """
+    前缀和索引 - 内存映射的只读前缀和数组
+    range_sum(i, j) = P[j + 1] - P[i]，任意区间求和都只读两个数，与区间长度无关
+    """
+
+    def __init__(self, path: str):
+        """
+        打开已经建好的索引文件
+        Args:
+            path: 索引文件路径
+        """
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._mapped = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # 空文件无法映射
+            self._file.close()
+            raise ValueError(f"不是有效的索引文件: {path}")
+        try:
+            (self.typecode, self.count,
+             self.source_size, self.source_mtime) = _read_header(self._mapped, path, PREFIX_MAGIC)
+        except ValueError:
+            self.close()
+            raise
+        end = INDEX_HEADER_SIZE + (self.count + 1) * array(self.typecode).itemsize
+        self._prefix = memoryview(self._mapped)[INDEX_HEADER_SIZE:end].cast(self.typecode)
+
+    @classmethod
+    def build(cls, values: array, path: str, source: Optional[str] = None) -> "PrefixSumIndex":
+        """
+        为一组数值建立前缀和索引文件并打开
+        Args:
+            values: 'q' 或 'd' 类型的数值数组
+            path: 索引文件路径
+            source: 数据源文件路径，记录它的大小和修改时间用于判断索引是否过期
+        """
+        chunks = (values[start:start + CHUNK_SIZE] for start in range(0, len(values), CHUNK_SIZE))
+        _write_prefix_index(path, chunks, values.typecode, source)
+        return cls(path)
+
+    @classmethod
+    def load_or_build(cls, source: str, index_path: Optional[str] = None,
+                      column: Union[int, str] = 0, typecode: str = 'q') -> "PrefixSumIndex":
+        """
+        打开数据文件对应的索引；索引不存在或数据文件改动过时才重新建立
+        Args:
+            source: 数据文件路径（.csv 或二进制）
+            index_path: 索引文件路径，默认在 source 后面加上列名（CSV）或类型码（二进制）和 '.psum'
+            column, typecode: 见 iter_column
+        """
+        if index_path is None:
+            suffix = column if source.lower().endswith('.csv') else typecode
+            index_path = f"{source}.{suffix}.psum"
+        if os.path.exists(index_path):
+            try:
+                index = cls(index_path)
+            except ValueError:
+                index = None  # 旧格式或损坏的索引，重建
+            if index is not None:
+                if (index.source_size, index.source_mtime) == _source_signature(source):
+                    return index
+                index.close()
+        # 边读边写，不把整列数据读进内存
+        _write_prefix_index(index_path, iter_column(source, column, typecode), typecode, source)
+        return cls(index_path)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self) -> "PrefixSumIndex":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """释放映射和文件"""
+        prefix = getattr(self, '_prefix', None)
+        if prefix is not None:
+            prefix.release()
+        self._mapped.close()
+        self._file.close()
+
+    def prefix_sum(self, stop: int) -> Number:
+        """前 stop 个数的和"""
+        if not 0 <= stop <= self.count:
+            raise IndexError(f"位置超出范围: {stop}")
+        return self._prefix[stop]
+
+    def range_sum(self, start: int, end: int) -> Number:
+        """
+        第 start 到第 end 个数（从0开始，包含两端）的和
+        """
+        if not 0 <= start <= end < self.count:
+            raise IndexError(f"区间超出范围: [{start}, {end}]")
+        return self._prefix[end + 1] - self._prefix[start]
+
+    def range_average(self, start: int, end: int) -> float:
+        """区间平均值"""
+        return self.range_sum(start, end) / (end - start + 1)
+
+
+class FenwickTree:
+    """
+    树状数组（Fenwick树）- 支持修改的区间求和
+    单点修改和前缀求和都是 O(log n)；整棵树可以保存为文件，下次直接加载
+    """
+
+    def __init__(self, values: array):
+        """
+        用一组数值 O(n) 建树
+        Args:
+            values: 'q' 或 'd' 类型的数值数组
+        """
+        if values.typecode not in ('q', 'd'):
+            raise ValueError("类型码必须是 'q' 或 'd'")
+        tree = array(values.typecode, values)
+        size = len(tree)
+        try:
+            for i in range(size):
+                parent = i | (i + 1)
+                if parent < size:
+                    tree[parent] += tree[i]
+        except OverflowError:
+            raise ValueError("区间和超出int64范围，请改用浮点类型 'd'")
+        self._tree = tree
+        self.count = size
+
+    @classmethod
+    def load(cls, path: str) -> "FenwickTree":
+        """从 save() 写出的文件加载整棵树，不需要原始数据"""
+        with open(path, 'rb') as f:
+            data = f.read()
+        typecode, count, _, _ = _read_header(data, path, FENWICK_MAGIC)
+        tree = cls.__new__(cls)
+        tree._tree = array(typecode)
+        tree._tree.frombytes(data[INDEX_HEADER_SIZE:INDEX_HEADER_SIZE + count * tree._tree.itemsize])
+        tree.count = count
+        return tree
+
+    def save(self, path: str, source: Optional[str] = None) -> None:
+        """把整棵树写入文件"""
+        _write_index(path, FENWICK_MAGIC, self._tree, self.count, source)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, position: int, delta: Number) -> None:
+        """第 position 个数加上 delta"""
+        if not 0 <= position < self.count:
+            raise IndexError(f"位置超出范围: {position}")
+        tree = self._tree
+        try:
+            while position < self.count:
+                tree[position] += delta
+                position |= position + 1
+        except OverflowError:
+            raise ValueError("区间和超出int64范围，请改用浮点类型 'd'")
+
+    def update(self, position: int, value: Number) -> None:
+        """把第 position 个数改为 value（当前值由两次前缀求和得到，不需要另存原数组）"""
+        self.add(position, value - self.range_sum(position, position))
+
+    def prefix_sum(self, stop: int) -> Number:
+        """前 stop 个数的和"""
+        if not 0 <= stop <= self.count:
+            raise IndexError(f"位置超出范围: {stop}")
+        tree = self._tree
+        total = 0 if tree.typecode == 'q' else 0.0
+        while stop > 0:
+            total += tree[stop - 1]
+            stop &= stop - 1
+        return total
+
+    def range_sum(self, start: int, end: int) -> Number:
+        """第 start 到第 end 个数（从0开始，包含两端）的和"""
+        if not 0 <= start <= end < self.count:
+            raise IndexError(f"区间超出范围: [{start}, {end}]")
+        return self.prefix_sum(end + 1) - self.prefix_sum(start)
+
+
+def demonstrate_index(source: str, column: Union[int, str], typecode: str,
+                      queries: List[Tuple[int, int]]) -> None:
+    """演示：打开（或建立）索引并回答区间求和查询"""
+    started = time.perf_counter()
+    with PrefixSumIndex.load_or_build(source, column=column, typecode=typecode) as index:
+        print(f"索引就绪: {len(index)} 个数, 用时 {time.perf_counter() - started:.4f}秒 ({index.path})")
+        for start, end in queries:
+            print(f"  [{start}, {end}] 的和: {index.range_sum(start, end)}, "
+                  f"平均值: {index.range_average(start, end):.4f}")
+
+
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """命令行参数"""
+    parser = argparse.ArgumentParser(description="区间求和索引")
+    parser.add_argument('source', help="数据文件（.csv 或本机字节序的二进制数组）")
+    parser.add_argument('--column', default='0', help="CSV列号或列名")
+    parser.add_argument('--typecode', default='q', choices=['q', 'd'], help="二进制文件元素类型")
+    parser.add_argument('--query', nargs=2, type=int, action='append', default=[],
+                        metavar=('START', 'END'), help="查询区间（从0开始，包含两端），可重复")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    arguments = parse_arguments()
+    column = int(arguments.column) if arguments.column.isdigit() else arguments.column
+    try:
+        demonstrate_index(arguments.source, column, arguments.typecode, arguments.query)
+    except (OSError, ValueError, IndexError) as e:
+        print(f"发生错误: {e}")
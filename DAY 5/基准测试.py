@@ -0,0 +1,220 @@
+"""
+基准测试引擎 - 给"哪个方法更快"提供可靠的测量
+Version: 1.0
+Author: wei si qi
+功能: perf_counter_ns 计时、自动校准循环次数、预热、
+      最小值/中位数/四分位距与中位数置信区间、JSON基线保存与回归检测
+"""
+
+import json
+import math
+import platform
+import statistics
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+# 单个样本至少持续这么久，计时器分辨率带来的误差才可以忽略
+MIN_SAMPLE_NS = 2_000_000
+# 每个候选方法的总测量时间预算
+TIME_BUDGET_NS = 1_000_000_000
+# 中位数置信区间对应的正态分位数（95%）
+Z_95 = 1.96
+# 样本少于这个数时不判断差异是否显著
+MIN_SIGNIFICANT_SAMPLES = 5
+
+
+def calibrate(func: Callable, args: Tuple = (), min_sample_ns: int = MIN_SAMPLE_NS) -> Tuple[int, int]:
+    """
+    自动校准每个样本的循环次数：按 1, 2, 5, 10, 20, 50... 增加，直到一个样本的耗时达到 min_sample_ns
+    Args:
+        func: 被测函数
+        args: 调用参数
+        min_sample_ns: 单个样本的最短耗时（纳秒）
+    Returns:
+        (循环次数, 该循环次数下一个样本的耗时纳秒)
+    """
+    scale = 1
+    while True:
+        for factor in (1, 2, 5):
+            loops = factor * scale
+            elapsed = _time_loops(func, args, loops)
+            if elapsed >= min_sample_ns:
+                return loops, elapsed
+        scale *= 10
+
+
+def _time_loops(func: Callable, args: Tuple, loops: int) -> int:
+    """连续调用 loops 次的总耗时（纳秒）"""
+    iterations = range(loops)
+    started = time.perf_counter_ns()
+    for _ in iterations:
+        func(*args)
+    return time.perf_counter_ns() - started
+
+
+def _median_ci(sorted_samples: List[float]) -> Tuple[float, float]:
+    """
+    中位数的95%置信区间（不假设分布：按二项分布取两侧的次序统计量）
+    """
+    n = len(sorted_samples)
+    half_width = Z_95 * math.sqrt(n) / 2
+    low = max(0, math.floor(n / 2 - half_width))
+    high = min(n - 1, math.ceil(n / 2 + half_width) - 1)
+    return sorted_samples[low], sorted_samples[high]
+
+
+def benchmark(func: Callable, args: Tuple = (), name: Optional[str] = None,
+              repeat: int = 25, warmup: int = 2,
+              time_budget_ns: int = TIME_BUDGET_NS) -> Dict:
+    """
+    测量一个函数的单次调用耗时
+    Args:
+        func: 被测函数
+        args: 调用参数
+        name: 结果中显示的名称，默认为函数名
+        repeat: 最多采集的样本数，按时间预算减少；单个样本就用完预算时
+                不再重复运行，直接用校准那一次测量作为唯一样本
+        warmup: 预热样本数，不计入统计
+        time_budget_ns: 总测量时间预算（纳秒）
+    Returns:
+        统计结果字典，时间单位都是纳秒/次
+    """
+    loops, sample_ns = calibrate(func, args)
+    samples_allowed = min(repeat, time_budget_ns // max(sample_ns, 1))
+
+    if samples_allowed <= 1:
+        # 一次调用就用完了预算（例如十亿次的循环求和），不能再跑好几遍
+        samples = [sample_ns / loops]
+    else:
+        # 样本数受预算限制说明单个样本就很慢，校准那一轮已经起到了预热的作用
+        if samples_allowed == repeat:
+            for _ in range(warmup):
+                _time_loops(func, args, loops)
+        samples = sorted(_time_loops(func, args, loops) / loops for _ in range(samples_allowed))
+
+    if len(samples) > 1:
+        q1, median, q3 = statistics.quantiles(samples, n=4, method='inclusive')
+    else:
+        q1 = q3 = samples[0]
+    ci_low, ci_high = _median_ci(samples)
+
+    return {
+        'name': name or getattr(func, '__name__', 'func'),
+        'loops': loops,
+        'samples': len(samples),
+        'min_ns': samples[0],
+        'median_ns': statistics.median(samples),
+        'q1_ns': q1,
+        'q3_ns': q3,
+        'iqr_ns': q3 - q1,
+        'ci_low_ns': ci_low,
+        'ci_high_ns': ci_high,
+        'mean_ns': statistics.fmean(samples),
+        'stdev_ns': statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+
+def compare(candidates: Dict[str, Tuple[Callable, Tuple]], **options) -> Dict:
+    """
+    测量多个候选实现并判断哪个最快
+    Args:
+        candidates: {名称: (函数, 参数元组)}
+        options: 传给 benchmark 的其他参数
+    Returns:
+        {'results': {名称: 统计结果}, 'fastest': 名称, 'significant': 是否显著更快,
+         'enough_samples': 每个候选的样本数是否都足以判断显著性}
+        只有样本足够、且最快者中位数置信区间的上界低于其他所有候选的下界，才算显著
+    """
+    results = {name: benchmark(func, args, name=name, **options)
+               for name, (func, args) in candidates.items()}
+    fastest = min(results, key=lambda name: results[name]['median_ns'])
+    enough_samples = all(result['samples'] >= MIN_SIGNIFICANT_SAMPLES for result in results.values())
+    significant = enough_samples and all(results[fastest]['ci_high_ns'] < result['ci_low_ns']
+                                         for name, result in results.items() if name != fastest)
+    return {'results': results, 'fastest': fastest, 'significant': significant,
+            'enough_samples': enough_samples}
+
+
+def format_ns(value: float) -> str:
+    """把纳秒换成合适的单位"""
+    for unit, scale in (('秒', 1e9), ('毫秒', 1e6), ('微秒', 1e3)):
+        if value >= scale:
+            return f"{value / scale:.3f} {unit}"
+    return f"{value:.1f} 纳秒"
+
+
+def print_report(comparison: Dict) -> None:
+    """打印对比表格和结论"""
+    results = comparison['results']
+    print(f"{'方法':>10} {'最小值':>12} {'中位数':>12} {'四分位距':>12} {'95%置信区间':>28} {'样本':>8}")
+    for name, result in results.items():
+        interval = f"[{format_ns(result['ci_low_ns'])}, {format_ns(result['ci_high_ns'])}]"
+        print(f"{name:>10} {format_ns(result['min_ns']):>14} {format_ns(result['median_ns']):>14} "
+              f"{format_ns(result['iqr_ns']):>14} {interval:>30} {result['samples']:>4}×{result['loops']}")
+
+    fastest = comparison['fastest']
+    if comparison['significant']:
+        print(f"\n最快方法: {fastest.upper()}（置信区间不重叠，差异显著）")
+    elif not comparison.get('enough_samples', True):
+        print(f"\n最快方法: {fastest.upper()}（有的方法一次就用完了时间预算，样本太少，无法判断是否显著）")
+    else:
+        print(f"\n最快方法: {fastest.upper()}（与其他方法的置信区间重叠，差异不显著）")
+
+
+def save_baseline(path: str, comparison: Dict) -> None:
+    """
+    把一次对比的结果保存为JSON基线
+    """
+    baseline = {
+        'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': comparison['results'],
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, ensure_ascii=False, indent=2)
+
+
+def check_regressions(comparison: Dict, baseline_path: str, threshold: float = 0.10) -> List[Dict]:
+    """
+    与保存的基线对比
+    置信区间下界比基线中位数慢 threshold 以上记为回归，上界比基线快 threshold 以上记为提升
+    Args:
+        comparison: compare() 的返回值
+        baseline_path: save_baseline() 写出的文件
+        threshold: 相对变化阈值
+    Returns:
+        每个方法一条: {'name', 'baseline_ns', 'current_ns', 'change', 'status'}，
+        status 为 'regression' / 'improvement' / 'unchanged'
+    """
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)['results']
+
+    report = []
+    for name, result in comparison['results'].items():
+        if name not in baseline:
+            continue
+        reference = baseline[name]['median_ns']
+        if result['ci_low_ns'] > reference * (1 + threshold):
+            status = 'regression'
+        elif result['ci_high_ns'] < reference * (1 - threshold):
+            status = 'improvement'
+        else:
+            status = 'unchanged'
+        report.append({
+            'name': name,
+            'baseline_ns': reference,
+            'current_ns': result['median_ns'],
+            'change': result['median_ns'] / reference - 1 if reference else 0.0,
+            'status': status,
+        })
+    return report
+
+
+def print_regressions(report: List[Dict]) -> None:
+    """打印与基线的对比"""
+    labels = {'regression': '⚠️  回归', 'improvement': '✅ 提升', 'unchanged': '持平'}
+    print("\n与基线对比:")
+    for item in report:
+        print(f"  {item['name']:>10}: {format_ns(item['baseline_ns'])} → {format_ns(item['current_ns'])} "
+              f"({item['change']:+.1%}) {labels[item['status']]}")
@@ -5,17 +5,377 @@ Author: wei si qi
 功能: 提供多种数学计算方法和统计分析
 """
 
+import os
 import time
 import math
+import struct
+import threading
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Tuple, Dict
 
+import 基准测试 as benchmark
+
+try:
+    import numpy as np  # 可选依赖：批量查询有NumPy时走向量化计算
+except ImportError:
+    np = None
+
+# 批量查询中 |start + end| * count 超过这个值的行改用Python整数计算，保证int64不溢出
+_INT64_SAFE_PRODUCT = 2.0 ** 62
+
+# 交互模式中 loop/builtin 求和超过这么多个数时转到后台执行
+BACKGROUND_THRESHOLD = 10_000_000
+# 后台任务每个分块的数字个数
+BACKGROUND_CHUNK = 5_000_000
+# 交互模式中整除组合查询不超过这么多个数时才提供与逐个枚举的对比（枚举是 O(n)，对比要跑两遍）
+DIVISIBLE_COMPARE_THRESHOLD = 1_000_000
+
+class CalculationHistory:
+    """
+    定长环形缓冲区的计算历史
+    每条记录拆成几列定长数组（方法编号、起点、终点、结果、耗时）存放，容量满了覆盖最旧的记录，
+    长时间运行内存也不会增长。超出int64的整数单独存放在一个小字典里。
+    可选的磁盘日志只追加写入，攒够一批才落盘；重新打开时从日志恢复最近的记录。
+    """
+    
+    METHODS = ('loop', 'formula', 'builtin', 'batch')
+    LOG_MAGIC = b'CHLG\x01'
+    _LOG_RECORD = struct.Struct('<Bd')  # 方法编号, 耗时；后面跟三个变长整数
+    
+    def __init__(self, capacity: int = 1000, log_path: str = None, flush_every: int = 64):
+        """
+        参数:
+        capacity: 最多保留的记录条数
+        log_path: 追加写入的二进制日志路径, None 表示不写日志
+        flush_every: 日志攒够多少条记录写一次盘
+        """
+        if capacity <= 0:
+            raise ValueError("历史记录容量必须是正整数")
+        self.capacity = capacity
+        self._methods = array('B', bytes(capacity))
+        self._starts = array('q', bytes(8 * capacity))
+        self._ends = array('q', bytes(8 * capacity))
+        self._results = array('q', bytes(8 * capacity))
+        self._durations = array('d', bytes(8 * capacity))
+        self._big: Dict[Tuple[int, int], int] = {}  # (列号, 槽位) -> 超出int64的整数
+        self._next = 0
+        self._size = 0
+        self._lock = threading.Lock()  # 后台任务会在其他线程写入历史
+        
+        self.log_path = log_path
+        self.flush_every = flush_every
+        self._pending = bytearray()
+        self._pending_count = 0
+        if log_path is not None:
+            if os.path.exists(log_path) and os.path.getsize(log_path) > 0:
+                # 只有最近 capacity 条记录需要放进缓冲区
+                recent = deque(maxlen=capacity)
+                valid_end = len(self.LOG_MAGIC)
+                for valid_end, record in self._scan_log(log_path):
+                    recent.append(record)
+                for record in recent:
+                    self._store(*record)
+                # 截掉末尾写到一半的记录，否则之后追加的记录会和它错位
+                if os.path.getsize(log_path) > valid_end:
+                    os.truncate(log_path, valid_end)
+            else:
+                with open(log_path, 'wb') as f:
+                    f.write(self.LOG_MAGIC)
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def __iter__(self):
+        """从旧到新逐条生成记录字典"""
+        for offset in range(self._size):
+            slot = (self._next - self._size + offset) % self.capacity
+            method = self.METHODS[self._methods[slot]]
+            start, end, result = (self._column_value(column, slot) for column in range(3))
+            record = {
+                'method': method,
+                'range': (start, end),
+                'result': result,
+                'execution_time': self._durations[slot]
+            }
+            if method == 'batch':
+                record['queries'] = result
+            yield record
+    
+    def append(self, method: str, start: int, end: int, result: int, duration: float) -> None:
+        """
+        添加一条记录
+        批量查询 (method='batch') 的 start/end 是端点范围, result 是查询个数
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"未知的计算方法: {method}")
+        with self._lock:
+            self._store(method, start, end, result, duration)
+            if self.log_path is not None:
+                self._pending += self._LOG_RECORD.pack(self.METHODS.index(method), duration)
+                for value in (start, end, result):
+                    self._pending += self._encode_int(value)
+                self._pending_count += 1
+                if self._pending_count >= self.flush_every:
+                    self._write_pending()
+    
+    def _store(self, method: str, start: int, end: int, result: int, duration: float) -> None:
+        """写入环形缓冲区的下一个槽位，覆盖最旧的记录"""
+        slot = self._next
+        self._methods[slot] = self.METHODS.index(method)
+        for column, (values, value) in enumerate(((self._starts, start), (self._ends, end),
+                                                  (self._results, result))):
+            self._big.pop((column, slot), None)
+            if -2 ** 63 <= value < 2 ** 63:
+                values[slot] = value
+            else:
+                values[slot] = 0
+                self._big[(column, slot)] = value
+        self._durations[slot] = duration
+        self._next = (slot + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+    
+    def _column_value(self, column: int, slot: int) -> int:
+        """读取起点/终点/结果列的一个值"""
+        if (column, slot) in self._big:
+            return self._big[(column, slot)]
+        return (self._starts, self._ends, self._results)[column][slot]
+    
+    def clear(self) -> None:
+        """清空内存中的记录（磁盘日志保持只追加，不受影响）"""
+        with self._lock:
+            self._big.clear()
+            self._next = 0
+            self._size = 0
+    
+    def flush(self) -> None:
+        """把攒着的日志记录写到磁盘"""
+        with self._lock:
+            self._write_pending()
+    
+    def _write_pending(self) -> None:
+        """写出攒着的日志记录（调用方持有锁）"""
+        if self.log_path is None or not self._pending:
+            return
+        with open(self.log_path, 'ab') as f:
+            f.write(self._pending)
+        self._pending.clear()
+        self._pending_count = 0
+    
+    def close(self) -> None:
+        """写出剩余日志"""
+        self.flush()
+    
+    @staticmethod
+    def _encode_int(value: int) -> bytes:
+        """变长整数：1字节长度 + 小端补码"""
+        length = (value.bit_length() + 8) // 8
+        return bytes([length]) + value.to_bytes(length, 'little', signed=True)
+    
+    @classmethod
+    def read_log(cls, log_path: str):
+        """
+        逐条读取日志, 生成 (方法, 起点, 终点, 结果, 耗时)
+        末尾不完整的记录（写到一半时进程退出）会被忽略
+        """
+        for _, record in cls._scan_log(log_path):
+            yield record
+    
+    @classmethod
+    def _scan_log(cls, log_path: str):
+        """
+        流式读取日志, 生成 (这条记录结束处的文件偏移, 记录)；不把整个日志读进内存
+        """
+        with open(log_path, 'rb') as f:
+            if f.read(len(cls.LOG_MAGIC)) != cls.LOG_MAGIC:
+                raise ValueError(f"不是有效的历史日志: {log_path}")
+            position = len(cls.LOG_MAGIC)
+            while True:
+                header = f.read(cls._LOG_RECORD.size)
+                if len(header) < cls._LOG_RECORD.size:
+                    return
+                code, duration = cls._LOG_RECORD.unpack(header)
+                if code >= len(cls.METHODS):
+                    raise ValueError(f"历史日志已损坏: {log_path}")
+                position += len(header)
+                values = []
+                for _ in range(3):
+                    length = f.read(1)
+                    if not length:
+                        return
+                    raw = f.read(length[0])
+                    if len(raw) < length[0]:
+                        return
+                    values.append(int.from_bytes(raw, 'little', signed=True))
+                    position += 1 + length[0]
+                yield position, (cls.METHODS[code], *values, duration)
+    
+    def method_counts(self) -> Dict[str, int]:
+        """每种方法的记录条数"""
+        # 缓冲区写满之前有效记录就是前 _size 个槽位；写满之后是全部槽位
+        methods = self._methods[:self._size]
+        return {method: methods.count(code) for code, method in enumerate(self.METHODS)
+                if methods.count(code)}
+    
+    def timing_stats(self) -> Dict[str, Dict]:
+        """
+        每种方法的耗时统计: 条数、平均耗时、p95耗时（最近秩法）
+        直接在定长数组上计算, 不构造记录字典
+        """
+        size = self._size
+        if np is not None:
+            methods = np.frombuffer(self._methods, dtype=np.uint8)[:size]
+            durations = np.frombuffer(self._durations, dtype=np.float64)[:size]
+        else:
+            methods = self._methods[:size]
+            durations = self._durations[:size]
+        
+        stats = {}
+        for code, method in enumerate(self.METHODS):
+            if np is not None:
+                selected = np.sort(durations[methods == code])
+            else:
+                selected = sorted(d for m, d in zip(methods, durations) if m == code)
+            count = len(selected)
+            if count:
+                stats[method] = {
+                    'count': count,
+                    'mean': float(sum(selected) / count if np is None else selected.mean()),
+                    'p95': float(selected[math.ceil(0.95 * count) - 1])
+                }
+        return stats
+
+
+def _sum_chunk(method: str, start: int, end: int) -> int:
+    """后台任务的一个分块（模块级函数，才能交给进程池）"""
+    if method == 'builtin':
+        return sum(range(start, end + 1))
+    total = 0
+    for i in range(start, end + 1):
+        total += i
+    return total
+
+
+class CalculationJob:
+    """
+    后台求和任务 - 把 [start, end] 切成分块依次提交，可以查看进度、随时取消
+    分块交给进程池时多个核同时计算，结果按分块顺序合并；取消或出错时，
+    已经连续完成的前缀部分作为部分结果写入历史记录
+    """
+    
+    def __init__(self, job_id: int, method: str, start: int, end: int,
+                 chunk_size: int, workers: int):
+        self.job_id = job_id
+        self.method = method
+        self.start = start
+        self.end = end
+        self.chunk_size = chunk_size
+        self.workers = workers
+        self.status = 'running'  # running / done / cancelled / failed
+        self.error = None
+        self.partial_sum = 0
+        self.reached = start - 1  # 已经合并进 partial_sum 的最后一个数
+        self.started = time.perf_counter()
+        self.finished = None
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+    
+    @property
+    def total_items(self) -> int:
+        return max(self.end - self.start + 1, 0)
+    
+    @property
+    def processed(self) -> int:
+        return self.reached - self.start + 1
+    
+    def cancel(self) -> None:
+        """请求取消；正在计算的分块算完后停止"""
+        self._cancel.set()
+    
+    def wait(self, timeout: float = None) -> bool:
+        """等待任务结束，返回是否已经结束"""
+        return self._done.wait(timeout)
+    
+    def progress(self) -> Dict:
+        """进度、吞吐量（个/秒）和预计剩余时间（秒）"""
+        elapsed = (self.finished or time.perf_counter()) - self.started
+        processed = self.processed
+        throughput = processed / elapsed if elapsed > 0 else 0.0
+        remaining = self.total_items - processed
+        return {
+            'job_id': self.job_id,
+            'status': self.status,
+            'fraction': processed / self.total_items if self.total_items else 1.0,
+            'processed': processed,
+            'partial_sum': self.partial_sum,
+            'throughput': throughput,
+            'eta': remaining / throughput if throughput > 0 and self.status == 'running' else None,
+            'elapsed': elapsed
+        }
+    
+    def _chunks(self):
+        """按顺序生成 (分块起点, 分块终点)"""
+        for chunk_start in range(self.start, self.end + 1, self.chunk_size):
+            yield chunk_start, min(chunk_start + self.chunk_size - 1, self.end)
+    
+    def _merge(self, chunk_end: int, value: int) -> None:
+        self.partial_sum += value
+        self.reached = chunk_end
+    
+    def run(self) -> None:
+        """在后台线程中执行；workers > 1 时用进程池并行计算分块"""
+        try:
+            if self.workers > 1:
+                self._run_parallel()
+            else:
+                for chunk_start, chunk_end in self._chunks():
+                    if self._cancel.is_set():
+                        break
+                    self._merge(chunk_end, _sum_chunk(self.method, chunk_start, chunk_end))
+            self.status = 'cancelled' if self._cancel.is_set() and self.reached < self.end else 'done'
+        except Exception as e:
+            self.status = 'failed'
+            self.error = e
+        finally:
+            self.finished = time.perf_counter()
+    
+    def _run_parallel(self) -> None:
+        """
+        最多同时挂起 workers * 2 个分块；按提交顺序取结果，保证已合并的总是连续前缀
+        """
+        chunks = self._chunks()
+        pending = deque()
+        pool = ProcessPoolExecutor(max_workers=self.workers)
+        try:
+            for chunk in chunks:
+                pending.append((chunk[1], pool.submit(_sum_chunk, self.method, *chunk)))
+                if len(pending) >= self.workers * 2:
+                    break
+            while pending and not self._cancel.is_set():
+                chunk_end, future = pending.popleft()
+                self._merge(chunk_end, future.result())
+                chunk = next(chunks, None)
+                if chunk is not None:
+                    pending.append((chunk[1], pool.submit(_sum_chunk, self.method, *chunk)))
+        finally:
+            # 取消时不等正在计算的分块，它们的结果反正用不上了
+            pool.shutdown(wait=not self._cancel.is_set(), cancel_futures=True)
+
+
 class NumberCalculator:
     """数字计算器类，提供各种数学计算功能"""
     
-    def __init__(self):
-        self.calculation_history = []
+    def __init__(self, history_capacity: int = 1000, history_log: str = None):
+        """
+        参数:
+        history_capacity: 历史记录最多保留的条数
+        history_log: 历史记录的追加日志路径, None 表示只保存在内存里
+        """
+        self.calculation_history = CalculationHistory(history_capacity, history_log)
         self.start_time = None
         self.end_time = None
+        self.jobs: List[CalculationJob] = []
     
     def sum_range(self, start: int, end: int, method: str = 'loop') -> Dict:
         """
@@ -51,9 +411,68 @@ class NumberCalculator:
             'average': result / (end - start + 1) if end >= start else 0
         }
         
-        self.calculation_history.append(calculation_info)
+        self.calculation_history.append(method, start, end, result, execution_time)
         return calculation_info
     
+    def submit_sum_range(self, start: int, end: int, method: str = 'loop',
+                         workers: int = None, chunk_size: int = BACKGROUND_CHUNK) -> CalculationJob:
+        """
+        在后台分块计算 sum_range, 立即返回任务对象
+        
+        参数:
+        method: 'loop' 或 'builtin' (formula 本身就是 O(1), 不需要后台执行)
+        workers: 进程数, 默认为CPU核数; 1 表示只在后台线程里计算
+        chunk_size: 每个分块的数字个数
+        
+        返回: CalculationJob, 结束后（包括被取消）把已完成部分写入历史记录
+        """
+        if method not in ('loop', 'builtin'):
+            raise ValueError("后台任务的方法必须是 'loop' 或 'builtin'")
+        if chunk_size <= 0:
+            raise ValueError("分块大小必须是正整数")
+        workers = workers or os.cpu_count() or 1
+        job = CalculationJob(len(self.jobs) + 1, method, start, end, chunk_size, workers)
+        self.jobs.append(job)
+        
+        def run() -> None:
+            job.run()
+            if job.processed > 0:
+                self.calculation_history.append(method, start, job.reached, job.partial_sum,
+                                                job.finished - job.started)
+            job._done.set()
+        
+        threading.Thread(target=run, name=f"sum-job-{job.job_id}", daemon=True).start()
+        return job
+    
+    def cancel_jobs(self, wait: bool = True) -> None:
+        """取消所有还在运行的后台任务"""
+        for job in self.jobs:
+            job.cancel()
+        if wait:
+            for job in self.jobs:
+                job.wait()
+    
+    def show_jobs(self) -> None:
+        """显示后台任务的进度"""
+        if not self.jobs:
+            print("暂无后台任务")
+            return
+        labels = {'running': '运行中', 'done': '已完成', 'cancelled': '已取消', 'failed': '失败'}
+        for job in self.jobs:
+            progress = job.progress()
+            line = (f"任务 #{job.job_id} [{labels[job.status]}] {job.method.upper()} "
+                    f"{job.start} - {job.end}: {progress['fraction']:.1%}, "
+                    f"{progress['throughput'] / 1e6:.2f} 百万个/秒")
+            if progress['eta'] is not None:
+                line += f", 预计还需 {progress['eta']:.1f}秒"
+            print(line)
+            if job.status == 'done':
+                print(f"  结果: {job.partial_sum}")
+            elif job.processed > 0:
+                print(f"  部分结果 ({job.start} - {job.reached}): {job.partial_sum}")
+            if job.error is not None:
+                print(f"  错误: {job.error}")
+    
     def _sum_by_loop(self, start: int, end: int) -> int:
         """使用循环计算和"""
         total = 0
@@ -72,19 +491,121 @@ class NumberCalculator:
         """使用内置函数计算和"""
         return sum(range(start, end + 1))
     
-    def sum_even_numbers(self, start: int, end: int) -> Dict:
-        """计算指定范围内偶数的和"""
+    def sum_range_batch(self, starts, ends) -> Dict:
+        """
+        批量计算许多区间 [starts[i], ends[i]] 的整数和
+        
+        参数:
+        starts, ends: 等长的NumPy整数数组、array('q') 或整数序列
+        
+        返回: 包含 results/counts/averages 数组的字典。结果全部是精确整数:
+        可能超出int64的行用Python整数计算, 此时 results 为object数组(无NumPy时为列表)。
+        空区间 (end < start) 的和、个数、平均值都是0。整批只记一条历史记录。
+        """
         self.start_time = time.time()
         
-        total = 0
-        count = 0
-        even_numbers = []
+        if np is not None:
+            results, counts, averages, overflowed = self._batch_by_numpy(starts, ends)
+        else:
+            results, counts, averages, overflowed = self._batch_by_python(starts, ends)
         
-        for i in range(start, end + 1):
-            if i % 2 == 0:
-                total += i
-                count += 1
-                even_numbers.append(i)
+        self.end_time = time.time()
+        execution_time = self.end_time - self.start_time
+        queries = len(counts)
+        
+        calculation_info = {
+            'results': results,
+            'counts': counts,
+            'averages': averages,
+            'method': 'batch',
+            'queries': queries,
+            'overflowed': overflowed,
+            'execution_time': execution_time,
+            'throughput': queries / execution_time if execution_time > 0 else float('inf')
+        }
+        
+        # 历史里只保存摘要, 不保存结果数组
+        self.calculation_history.append('batch', *(self._batch_bounds(starts, ends) if queries else (0, 0)),
+                                        queries, execution_time)
+        return calculation_info
+    
+    def _batch_bounds(self, starts, ends) -> Tuple[int, int]:
+        """批量查询的最小起点和最大终点（NumPy数组不逐个遍历）"""
+        if np is not None and isinstance(starts, np.ndarray) and isinstance(ends, np.ndarray):
+            return int(starts.min()), int(ends.max())
+        return min(starts), max(ends)
+    
+    def _batch_by_numpy(self, starts, ends) -> Tuple:
+        """
+        向量化批量求和: sum = (start + end) * count / 2
+        (start + end) 与 count 奇偶性相反, 乘积必为偶数, 右移一位即精确结果
+        """
+        try:
+            s = np.asarray(starts, dtype=np.int64)  # array('q') 直接共享内存
+            e = np.asarray(ends, dtype=np.int64)
+        except OverflowError:
+            # 有端点超出int64: 先按Python整数读入, 这些行在下面单独计算
+            s = np.array([int(value) for value in starts], dtype=object)
+            e = np.array([int(value) for value in ends], dtype=object)
+        if s.shape != e.shape:
+            raise ValueError("starts 和 ends 的长度必须相同")
+        
+        # 端点本身接近或超出int64边界时, start + end 就会溢出（不能用 np.abs: -2**63 取绝对值仍是负数）;
+        # 只有这些行用Python整数计算, 其余行照常向量化, 计算前先把它们的端点置0
+        wide = ((s <= -2 ** 62) | (s >= 2 ** 62) | (e <= -2 ** 62) | (e >= 2 ** 62)).astype(bool)
+        wide_rows = np.flatnonzero(wide)
+        if wide_rows.size:
+            endpoints = [(int(s[row]), int(e[row])) for row in wide_rows]
+            s = np.where(wide, 0, s).astype(np.int64)
+            e = np.where(wide, 0, e).astype(np.int64)
+        
+        pair_sums = s + e
+        counts = np.maximum(e - s + 1, 0)
+        results = (pair_sums * counts) >> 1
+        averages = np.where(counts > 0, pair_sums * 0.5, 0.0)
+        
+        # 用浮点数估计乘积大小, 可能溢出的行用Python整数重算
+        overflow = np.abs(pair_sums.astype(np.float64)) * counts >= _INT64_SAFE_PRODUCT
+        overflowed = int(np.count_nonzero(overflow)) + int(wide_rows.size)
+        if overflowed:
+            results = results.astype(object)
+            rows = np.flatnonzero(overflow)
+            results[rows] = [int(a) * int(n) >> 1 for a, n in zip(pair_sums[rows], counts[rows])]
+        if wide_rows.size:
+            wide_counts = [max(end - start + 1, 0) for start, end in endpoints]
+            if max(wide_counts) >= 2 ** 63:  # 例如 [-2**63, 2**63-1] 共 2**64 个数
+                counts = counts.astype(object)
+            counts[wide_rows] = wide_counts
+            results[wide_rows] = [(start + end) * count >> 1
+                                  for (start, end), count in zip(endpoints, wide_counts)]
+            averages[wide_rows] = [(start + end) / 2 if count else 0.0
+                                   for (start, end), count in zip(endpoints, wide_counts)]
+        return results, counts, averages, overflowed
+    
+    def _batch_by_python(self, starts, ends) -> Tuple:
+        """没有NumPy时的逐个计算"""
+        if len(starts) != len(ends):
+            raise ValueError("starts 和 ends 的长度必须相同")
+        results = []
+        counts = []
+        averages = []
+        for start, end in zip(starts, ends):
+            start, end = int(start), int(end)
+            count = max(end - start + 1, 0)
+            results.append((start + end) * count >> 1)
+            counts.append(count)
+            averages.append((start + end) / 2 if count else 0.0)
+        
+        overflowed = sum(1 for value in results if not -2 ** 63 <= value < 2 ** 63)
+        if not overflowed:
+            results = array('q', results)
+        return results, counts, averages, overflowed
+    
+    def sum_even_numbers(self, start: int, end: int, method: str = 'formula') -> Dict:
+        """计算指定范围内偶数的和"""
+        self.start_time = time.time()
+        
+        total, count, even_numbers = self._progression_sum(start, end, 2, 0, method)
         
         self.end_time = time.time()
         
@@ -96,19 +617,11 @@ class NumberCalculator:
             'execution_time': self.end_time - self.start_time
         }
     
-    def sum_odd_numbers(self, start: int, end: int) -> Dict:
+    def sum_odd_numbers(self, start: int, end: int, method: str = 'formula') -> Dict:
         """计算指定范围内奇数的和"""
         self.start_time = time.time()
         
-        total = 0
-        count = 0
-        odd_numbers = []
-        
-        for i in range(start, end + 1):
-            if i % 2 != 0:
-                total += i
-                count += 1
-                odd_numbers.append(i)
+        total, count, odd_numbers = self._progression_sum(start, end, 2, 1, method)
         
         self.end_time = time.time()
         
@@ -120,19 +633,14 @@ class NumberCalculator:
             'execution_time': self.end_time - self.start_time
         }
     
-    def sum_multiples(self, start: int, end: int, multiple: int) -> Dict:
-        """计算指定范围内某个数的倍数的和"""
-        self.start_time = time.time()
+    def sum_multiples(self, start: int, end: int, multiple: int, method: str = 'formula') -> Dict:
+        """计算指定范围内某个数的倍数的和（负倍数与其绝对值的倍数相同）"""
+        if multiple == 0:
+            raise ZeroDivisionError("倍数不能为0")
         
-        total = 0
-        count = 0
-        multiples_list = []
+        self.start_time = time.time()
         
-        for i in range(start, end + 1):
-            if i % multiple == 0:
-                total += i
-                count += 1
-                multiples_list.append(i)
+        total, count, multiples_list = self._progression_sum(start, end, abs(multiple), 0, method)
         
         self.end_time = time.time()
         
@@ -145,38 +653,274 @@ class NumberCalculator:
             'execution_time': self.end_time - self.start_time
         }
     
-    def get_statistics(self, start: int, end: int) -> Dict:
-        """获取范围内数字的统计信息"""
-        numbers = list(range(start, end + 1))
+    def _progression_sum(self, start: int, end: int, modulus: int, remainder: int,
+                         method: str = 'formula') -> Tuple[int, int, range]:
+        """
+        计算 [start, end] 内满足 i % modulus == remainder 的整数的和与个数
+        
+        参数:
+        modulus: 正整数模数
+        remainder: 余数 (0 <= remainder < modulus)
+        method: 'formula' 按等差数列公式 O(1) 计算, 'loop' 逐个枚举
+        
+        返回: (总和, 个数, 这些数) —— formula 方法返回惰性的 range, loop 方法返回列表
+        """
+        if method == 'loop':
+            total = 0
+            count = 0
+            numbers = []
+            for i in range(start, end + 1):
+                if i % modulus == remainder:
+                    total += i
+                    count += 1
+                    numbers.append(i)
+            return total, count, numbers
+        if method != 'formula':
+            raise ValueError("方法必须是 'loop' 或 'formula'")
+        
+        first, last = self._progression_bounds(start, end, modulus, remainder)
+        if first > last:
+            return 0, 0, range(first, first)
+        
+        count = (last - first) // modulus + 1
+        total = (first + last) * count // 2
+        return total, count, range(first, last + 1, modulus)
+    
+    @staticmethod
+    def _progression_bounds(start: int, end: int, modulus: int, remainder: int) -> Tuple[int, int]:
+        """
+        等差数列的首末项: 首项是 >= start 的第一个匹配数, 末项是 <= end 的最后一个匹配数
+        首项大于末项表示没有匹配的数
+        """
+        return start + (remainder - start) % modulus, end - (end - remainder) % modulus
+    
+    def sum_divisible(self, start: int, end: int, include: List[int],
+                      exclude: List[int] = (), method: str = 'formula') -> Dict:
+        """
+        计算范围内能被 include 中任意一个数整除、且不能被 exclude 中任何数整除的整数之和
+        例如 sum_divisible(1, 100, [3, 5], [7]) 即"被3或5整除但不被7整除"
+        
+        参数:
+        include: 包含的除数, 为空表示范围内所有整数
+        exclude: 排除的除数
+        method: 'formula' 按最小公倍数容斥 + 等差数列公式, 'loop' 逐个枚举
+        
+        返回: 包含结果和统计信息的字典
+        """
+        include = sorted({abs(d) for d in include})
+        exclude = sorted({abs(d) for d in exclude})
+        if 0 in include or 0 in exclude:
+            raise ZeroDivisionError("除数不能为0")
+        
+        self.start_time = time.time()
+        
+        if method == 'loop':
+            total, count = self._divisible_by_loop(start, end, include, exclude)
+            terms = pruned = 0
+        elif method == 'formula':
+            total, count, terms, pruned = self._inclusion_exclusion(start, end, include, exclude)
+        else:
+            raise ValueError("方法必须是 'loop' 或 'formula'")
+        
+        self.end_time = time.time()
+        
+        return {
+            'result': total,
+            'count': count,
+            'include': include,
+            'exclude': exclude,
+            'average': total / count if count > 0 else 0,
+            'terms': terms,
+            'pruned': pruned,
+            'execution_time': self.end_time - self.start_time
+        }
+    
+    def _divisible_by_loop(self, start: int, end: int, include: List[int],
+                           exclude: List[int]) -> Tuple[int, int]:
+        """逐个枚举的整除组合求和, 返回 (总和, 个数)"""
+        total = 0
+        count = 0
+        for i in range(start, end + 1):
+            if ((not include or any(i % d == 0 for d in include))
+                    and not any(i % d == 0 for d in exclude)):
+                total += i
+                count += 1
+        return total, count
+    
+    def _inclusion_exclusion(self, start: int, end: int, include: List[int],
+                             exclude: List[int]) -> Tuple[int, int, int, int]:
+        """
+        容斥求和: 指示函数 (1 - Π(1 - [d|i])) * Π(1 - [e|i]) 展开后,
+        每个除数子集贡献 ±(其最小公倍数的倍数之和)
+        
+        0 能被任何数整除, 单独处理; 除去 0 之后, 最小公倍数超过 max(|start|, |end|)
+        的子集在范围内没有倍数, 它的所有超集也一样, 整棵子树直接剪掉
+        
+        返回: (总和, 个数, 计算的项数, 剪掉的子树数)
+        """
+        if start > end:
+            return 0, 0, 0, 0
+        
+        # 去掉冗余除数: 其他排除除数的倍数不用再排除; 其他包含除数的倍数不用再包含,
+        # 排除除数的倍数包含了也会被排除
+        exclude = [e for e in exclude if not any(e % f == 0 for f in exclude if f < e)]
+        reduced = [d for d in include
+                   if not any(d % f == 0 for f in include if f < d)
+                   and not any(d % e == 0 for e in exclude)]
+        if include and not reduced:
+            return 0, 0, 0, 0  # 每个包含除数都被排除了
+        include = reduced
+        
+        limit = max(abs(start), abs(end))
+        has_zero = start <= 0 <= end
+        divisors = [(d, True) for d in include] + [(d, False) for d in exclude]
+        total = 0
+        count = 0
+        terms = 0
+        pruned = 0
+        
+        # 栈元素: (下一个可选除数的位置, 当前最小公倍数, 已选包含除数个数, 已选除数总数)
+        stack = [(0, 1, 0, 0)]
+        while stack:
+            index, multiple, included, chosen = stack.pop()
+            if included or not include:
+                sign = (-1) ** chosen * (-1 if include else 1)
+                term_sum, term_count, _ = self._progression_sum(start, end, multiple, 0)
+                total += sign * term_sum
+                count += sign * (term_count - has_zero)
+                terms += 1
+            for position in range(index, len(divisors)):
+                divisor, is_include = divisors[position]
+                next_multiple = multiple * divisor // math.gcd(multiple, divisor)
+                if next_multiple > limit:
+                    pruned += 1
+                    continue
+                stack.append((position + 1, next_multiple,
+                              included + is_include, chosen + 1))
+        
+        # 0 属于"包含"集合, 但任何排除除数都会把它排除
+        if has_zero and not exclude:
+            count += 1
+        return total, count, terms, pruned
+    
+    def compare_divisible_query(self, start: int, end: int, include: List[int],
+                                exclude: List[int] = ()) -> Dict:
+        """
+        比较容斥公式与逐个枚举: 先各算一次核对结果, 再交给基准测试引擎测量耗时
+        
+        返回: {'formula': 公式结果, 'loop': 枚举结果, 'matched': 是否一致, 'comparison': 引擎的对比结果}
+        """
+        print(f"\n{'='*60}")
+        print(f"整除组合查询: [{start}, {end}] 被 {list(include) or '任意'} 整除"
+              f"{f', 不被 {list(exclude)} 整除' if exclude else ''}")
+        print(f"{'='*60}")
+        
+        formula = self.sum_divisible(start, end, include, exclude, 'formula')
+        loop = self.sum_divisible(start, end, include, exclude, 'loop')
+        for name, result in (('formula', formula), ('loop', loop)):
+            print(f"{name.upper():>8} 方法: 结果={result['result']:>10}, 个数={result['count']}")
+        
+        matched = (formula['result'], formula['count']) == (loop['result'], loop['count'])
+        print(f"\n容斥项数: {formula['terms']}, 剪枝: {formula['pruned']}, "
+              f"结果{'一致' if matched else '不一致!'}\n")
+        
+        # 直接测量内部实现（除数已由 sum_divisible 规范化）
+        arguments = (start, end, formula['include'], formula['exclude'])
+        comparison = benchmark.compare({'formula': (self._inclusion_exclusion, arguments),
+                                        'loop': (self._divisible_by_loop, arguments)})
+        benchmark.print_report(comparison)
+        return {'formula': formula, 'loop': loop, 'matched': matched, 'comparison': comparison}
+    
+    def get_statistics(self, start: int, end: int, step: int = 1, remainder: int = None) -> Dict:
+        """
+        获取范围内数字的统计信息 —— 按等差数列公式直接计算, 不生成任何列表
+        
+        参数:
+        start, end: 范围 (包含两端)
+        step: 公差, 默认1即范围内所有整数
+        remainder: 只统计 i % step == remainder 的数 (偶数: step=2, remainder=0;
+                   奇数: step=2, remainder=1; 倍数: step=m, remainder=0)。
+                   默认与 start 同余, 即 start, start+step, ... 这个数列
+        
+        返回: 统计信息字典, variance/std 为总体方差与总体标准差
+        """
+        if step <= 0:
+            raise ValueError("公差必须是正整数")
+        remainder = start % step if remainder is None else remainder % step
+        
+        first, last = self._progression_bounds(start, end, step, remainder)
+        if first > last:
+            raise ValueError("范围内没有符合条件的数字")
+        
+        count = (last - first) // step + 1
+        total = (first + last) * count // 2
+        
+        # 中位数: 奇数个取中间项, 偶数个取中间两项的平均
+        middle = first + (count - 1) // 2 * step
+        if count % 2:
+            median = middle
+        else:
+            pair = middle + middle + step
+            median = pair // 2 if pair % 2 == 0 else pair / 2
+        
+        # 等差数列的总体方差: d²(n² - 1) / 12
+        variance = step * step * (count * count - 1) / 12
         
         return {
-            'count': len(numbers),
-            'sum': sum(numbers),
-            'average': sum(numbers) / len(numbers),
-            'min': min(numbers),
-            'max': max(numbers),
-            'median': numbers[len(numbers) // 2],
-            'range_span': max(numbers) - min(numbers)
+            'count': count,
+            'sum': total,
+            'average': total / count,
+            'min': first,
+            'max': last,
+            'median': median,
+            'range_span': last - first,
+            'step': step,
+            'variance': variance,
+            'std': math.sqrt(variance)
         }
     
-    def compare_methods(self, start: int, end: int) -> None:
-        """比较不同计算方法的性能"""
+    def compare_methods(self, start: int, end: int, baseline: str = None,
+                        save_to: str = None) -> Dict:
+        """
+        比较不同计算方法的性能
+        每种方法先正常计算一次（结果和历史记录照旧），再交给基准测试引擎反复测量
+        
+        参数:
+        baseline: 已保存的JSON基线路径, 给出时报告回归/提升
+        save_to: 把本次测量保存为JSON基线的路径
+        
+        返回: 基准测试引擎的对比结果
+        """
         print(f"\n{'='*60}")
         print(f"性能比较: {start} 到 {end} 的求和")
         print(f"{'='*60}")
         
-        methods = ['loop', 'formula', 'builtin']
-        results = {}
+        implementations = {
+            'loop': self._sum_by_loop,
+            'formula': self._sum_by_formula,
+            'builtin': self._sum_by_builtin
+        }
         
-        for method in methods:
+        for method in implementations:
             result = self.sum_range(start, end, method)
-            results[method] = result
-            print(f"{method.upper():>8} 方法: 结果={result['result']:>10}, "
-                  f"时间={result['execution_time']:.6f}秒")
+            print(f"{method.upper():>8} 方法: 结果={result['result']:>10}")
+        print()
+        
+        # 直接测量内部实现, 反复调用不会写入历史记录
+        comparison = benchmark.compare({method: (func, (start, end))
+                                        for method, func in implementations.items()})
+        benchmark.print_report(comparison)
         
-        # 找出最快的方法
-        fastest = min(results.keys(), key=lambda k: results[k]['execution_time'])
-        print(f"\n最快方法: {fastest.upper()}")
+        if baseline:
+            benchmark.print_regressions(benchmark.check_regressions(comparison, baseline))
+        if save_to:
+            benchmark.save_baseline(save_to, comparison)
+            print(f"基线已保存: {save_to}")
+        return comparison
+    
+    def close(self) -> None:
+        """写出尚未落盘的历史日志"""
+        self.calculation_history.close()
     
     def show_history(self) -> None:
         """显示计算历史"""
@@ -189,11 +933,22 @@ class NumberCalculator:
         print(f"{'='*50}")
         
         for i, record in enumerate(self.calculation_history, 1):
+            if record['method'] == 'batch':
+                print(f"记录 {i}: BATCH 批量查询 {record['queries']} 个区间")
+                print(f"  端点范围: {record['range'][0]} - {record['range'][1]}")
+                print(f"  耗时: {record['execution_time']:.6f}秒")
+                print("-" * 30)
+                continue
             print(f"记录 {i}: {record['method'].upper()} 方法")
             print(f"  范围: {record['range'][0]} - {record['range'][1]}")
             print(f"  结果: {record['result']}")
             print(f"  耗时: {record['execution_time']:.6f}秒")
             print("-" * 30)
+        
+        print("按方法统计:")
+        for method, stats in self.calculation_history.timing_stats().items():
+            print(f"  {method.upper():>8}: {stats['count']} 次, 平均 {stats['mean']:.6f}秒, "
+                  f"p95 {stats['p95']:.6f}秒")
 
 def demonstrate_basic_functionality():
     """演示基本功能"""
@@ -222,17 +977,22 @@ def interactive_mode():
         print("6. 性能比较")
         print("7. 查看历史记录")
         print("8. 清除历史记录")
+        print("9. 整除组合查询")
+        print("10. 后台任务进度")
+        print("11. 取消后台任务")
         print("0. 退出")
         print("-" * 50)
         
         try:
-            choice = input("请选择功能 (0-8): ").strip()
+            choice = input("请选择功能 (0-11): ").strip()
             
             if choice == '0':
                 print("感谢使用！再见！")
+                calc.cancel_jobs()
+                calc.close()
                 break
             
-            elif choice in ['1', '2', '3', '4', '5', '6']:
+            elif choice in ['1', '2', '3', '4', '5', '6', '9']:
                 start = int(input("请输入起始数字: "))
                 end = int(input("请输入结束数字: "))
                 
@@ -244,6 +1004,11 @@ def interactive_mode():
                     method = input("选择计算方法 (loop/formula/builtin): ").strip()
                     if method not in ['loop', 'formula', 'builtin']:
                         method = 'loop'
+                    if method != 'formula' and end - start + 1 >= BACKGROUND_THRESHOLD:
+                        job = calc.submit_sum_range(start, end, method)
+                        print(f"\n范围较大, 已转到后台任务 #{job.job_id} ({job.workers} 个进程), "
+                              f"可用选项10查看进度、11取消")
+                        continue
                     result = calc.sum_range(start, end, method)
                     print(f"\n结果: {result['result']}")
                     print(f"方法: {result['method']}")
@@ -256,14 +1021,14 @@ def interactive_mode():
                     print(f"\n偶数和: {result['result']}")
                     print(f"偶数个数: {result['count']}")
                     print(f"平均值: {result['average']:.2f}")
-                    print(f"偶数列表: {result['numbers'][:10]}{'...' if len(result['numbers']) > 10 else ''}")
+                    print(f"偶数列表: {list(result['numbers'][:10])}{'...' if len(result['numbers']) > 10 else ''}")
                 
                 elif choice == '3':
                     result = calc.sum_odd_numbers(start, end)
                     print(f"\n奇数和: {result['result']}")
                     print(f"奇数个数: {result['count']}")
                     print(f"平均值: {result['average']:.2f}")
-                    print(f"奇数列表: {result['numbers'][:10]}{'...' if len(result['numbers']) > 10 else ''}")
+                    print(f"奇数列表: {list(result['numbers'][:10])}{'...' if len(result['numbers']) > 10 else ''}")
                 
                 elif choice == '4':
                     multiple = int(input("请输入倍数: "))
@@ -271,7 +1036,7 @@ def interactive_mode():
                     print(f"\n{multiple}的倍数和: {result['result']}")
                     print(f"倍数个数: {result['count']}")
                     print(f"平均值: {result['average']:.2f}")
-                    print(f"倍数列表: {result['numbers'][:10]}{'...' if len(result['numbers']) > 10 else ''}")
+                    print(f"倍数列表: {list(result['numbers'][:10])}{'...' if len(result['numbers']) > 10 else ''}")
                 
                 elif choice == '5':
                     stats = calc.get_statistics(start, end)
@@ -283,9 +1048,26 @@ def interactive_mode():
                     print(f"最大值: {stats['max']}")
                     print(f"中位数: {stats['median']}")
                     print(f"范围跨度: {stats['range_span']}")
+                    print(f"方差: {stats['variance']:.2f}")
+                    print(f"标准差: {stats['std']:.2f}")
                 
                 elif choice == '6':
                     calc.compare_methods(start, end)
+                
+                elif choice == '9':
+                    include = [int(x) for x in input("能被哪些数整除 (逗号分隔, 留空表示任意): ").replace('，', ',').split(',') if x.strip()]
+                    exclude = [int(x) for x in input("不能被哪些数整除 (逗号分隔, 可留空): ").replace('，', ',').split(',') if x.strip()]
+                    result = calc.sum_divisible(start, end, include, exclude, 'formula')
+                    print(f"\n结果: {result['result']}")
+                    print(f"数量: {result['count']}")
+                    print(f"平均值: {result['average']:.2f}")
+                    print(f"容斥项数: {result['terms']}, 剪枝: {result['pruned']}")
+                    print(f"执行时间: {result['execution_time']:.6f}秒")
+                    if end - start + 1 <= DIVISIBLE_COMPARE_THRESHOLD:
+                        if input("与逐个枚举对比性能? (y/n): ").strip().lower() in ['y', 'yes', '是']:
+                            calc.compare_divisible_query(start, end, include, exclude)
+                    else:
+                        print(f"范围超过 {DIVISIBLE_COMPARE_THRESHOLD} 个数, 不做逐个枚举对比")
             
             elif choice == '7':
                 calc.show_history()
@@ -294,6 +1076,14 @@ def interactive_mode():
                 calc.calculation_history.clear()
                 print("历史记录已清除！")
             
+            elif choice == '10':
+                calc.show_jobs()
+            
+            elif choice == '11':
+                calc.cancel_jobs()
+                print("后台任务已取消, 已完成的部分已写入历史记录")
+                calc.show_jobs()
+            
             else:
                 print("无效选择，请重新输入！")
         
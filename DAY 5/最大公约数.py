@@ -5,6 +5,8 @@ Author: wei si qi
 """
 import math
 
+import 基准测试 as benchmark
+
 
 def gcd_euclidean(a, b):
     """
@@ -68,33 +70,37 @@ def get_valid_input(prompt):
             print("请输入有效的整数！")
 
 
-def compare_algorithms(x, y):
+def compare_algorithms(x, y, baseline=None, save_to=None):
     """
     比较不同算法的效率
+    先各算一次核对结果，再交给基准测试引擎反复测量
     Args:
         x, y (int): 两个正整数
+        baseline (str): 已保存的JSON基线路径，给出时报告回归/提升
+        save_to (str): 把本次测量保存为JSON基线的路径
+    Returns:
+        dict: 基准测试引擎的对比结果
     """
-    import time
-    
-    # 测试暴力法
-    start_time = time.time()
-    gcd1 = gcd_brute_force(x, y)
-    brute_time = time.time() - start_time
+    algorithms = {
+        '暴力法': gcd_brute_force,
+        '欧几里得': gcd_euclidean,
+        '内置函数': math.gcd,
+    }
     
-    # 测试欧几里得算法
-    start_time = time.time()
-    gcd2 = gcd_euclidean(x, y)
-    euclidean_time = time.time() - start_time
+    print(f"\n算法效率对比:")
+    for name, func in algorithms.items():
+        print(f"{name + ':':<10} {func(x, y)}")
+    print()
     
-    # 测试内置函数
-    start_time = time.time()
-    gcd3 = math.gcd(x, y)
-    builtin_time = time.time() - start_time
+    comparison = benchmark.compare({name: (func, (x, y)) for name, func in algorithms.items()})
+    benchmark.print_report(comparison)
     
-    print(f"\n算法效率对比:")
-    print(f"暴力法:      {gcd1} (耗时: {brute_time*1000000:.2f} 微秒)")
-    print(f"欧几里得:    {gcd2} (耗时: {euclidean_time*1000000:.2f} 微秒)")
-    print(f"内置函数:    {gcd3} (耗时: {builtin_time*1000000:.2f} 微秒)")
+    if baseline:
+        benchmark.print_regressions(benchmark.check_regressions(comparison, baseline))
+    if save_to:
+        benchmark.save_baseline(save_to, comparison)
+        print(f"基线已保存: {save_to}")
+    return comparison
 
 
 def main():
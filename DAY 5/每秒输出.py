@@ -10,30 +10,361 @@ import datetime
 import threading
 import random
 import os
+import math
 from typing import List, Optional, Callable
+import asyncio
+import contextlib
+import queue
+from collections import deque
 import signal
 import sys
 
+# 多发射器模式下所有调度器合计保留的延迟记录条数
+EMITTER_HISTORY_BUDGET = 100_000
+
+
+class DeadlineScheduler:
+    """
+    基于单调时钟的绝对截止时间调度器
+    第 k 次输出的截止时间固定为 start + k * interval，每次只睡到下一个截止时间，
+    输出本身花的时间不会累积成漂移。某次输出超时导致错过截止时间时:
+        'catch_up' - 不睡眠，连续补上错过的输出
+        'skip'     - 跳过已经整个错过的输出，直接对齐到最近的截止时间
+    每次输出相对截止时间的延迟都会记录下来，用于统计。
+    """
+    
+    POLICIES = ('skip', 'catch_up')
+    
+    def __init__(self, interval: float, policy: str = 'skip',
+                 stop_event: Optional[threading.Event] = None,
+                 first_deadline: Optional[float] = None,
+                 history: int = 1000):
+        """
+        参数:
+        interval: 输出间隔（秒）
+        policy: 超时处理策略, 'skip' 或 'catch_up'
+        stop_event: 设置后调度立即结束（睡眠中也会被唤醒）
+        first_deadline: 第一次输出的 time.monotonic() 时间, 默认立即开始
+        history: 保留最近多少次的延迟记录
+        """
+        if interval <= 0:
+            raise ValueError("时间间隔必须大于0")
+        if policy not in self.POLICIES:
+            raise ValueError(f"超时策略必须是 {self.POLICIES} 之一")
+        self.interval = interval
+        self.policy = policy
+        self.stop_event = stop_event or threading.Event()
+        self.first_deadline = first_deadline
+        self.start = None
+        self.ticks_fired = 0
+        self.skipped = 0
+        self.total_lateness = 0.0
+        self.max_lateness = 0.0
+        self.last_lateness = 0.0
+        self.lateness = deque(maxlen=history)
+    
+    def ticks(self, count: Optional[int] = None, duration: Optional[float] = None):
+        """
+        生成每次输出的序号 k（第 k 个截止时间）；skip 策略下跳过的序号不会出现
+        
+        参数:
+        count: 最多输出次数
+        duration: 只在 start 之后这么多秒内的截止时间输出
+        """
+        self.start = self.first_deadline if self.first_deadline is not None else time.monotonic()
+        k = 0
+        while count is None or k < count:
+            deadline = self.start + k * self.interval
+            if duration is not None and deadline - self.start >= duration:
+                break
+            
+            now = time.monotonic()
+            if now < deadline:
+                if self.stop_event.wait(deadline - now):
+                    break
+                now = time.monotonic()
+            elif self.policy == 'skip':
+                missed = int((now - deadline) // self.interval)
+                if missed:
+                    k += missed
+                    self.skipped += missed
+                    continue  # 重新检查次数/时长限制并对齐到最近的截止时间
+            if self.stop_event.is_set():
+                break
+            
+            self._record(now - deadline)
+            yield k
+            k += 1
+    
+    async def async_ticks(self, count: Optional[int] = None, duration: Optional[float] = None):
+        """
+        ticks() 的协程版本：用 asyncio.sleep 等待截止时间，不占用线程
+        stop_event 在每次醒来时检查；需要立即停止时由调用方取消任务
+        """
+        self.start = self.first_deadline if self.first_deadline is not None else time.monotonic()
+        k = 0
+        while count is None or k < count:
+            deadline = self.start + k * self.interval
+            if duration is not None and deadline - self.start >= duration:
+                break
+            
+            now = time.monotonic()
+            if now < deadline:
+                await asyncio.sleep(deadline - now)
+                now = time.monotonic()
+            elif self.policy == 'skip':
+                missed = int((now - deadline) // self.interval)
+                if missed:
+                    k += missed
+                    self.skipped += missed
+                    continue
+            if self.stop_event.is_set():
+                break
+            
+            self._record(now - deadline)
+            yield k
+            k += 1
+    
+    def _record(self, lateness: float) -> None:
+        self.ticks_fired += 1
+        self.total_lateness += lateness
+        self.max_lateness = max(self.max_lateness, lateness)
+        self.last_lateness = lateness
+        self.lateness.append(lateness)
+    
+    def summary(self) -> dict:
+        """延迟统计（毫秒）"""
+        recent = sorted(self.lateness)
+        return {
+            'ticks': self.ticks_fired,
+            'skipped': self.skipped,
+            'mean_lateness_ms': self.total_lateness / self.ticks_fired * 1000 if self.ticks_fired else 0.0,
+            'p95_lateness_ms': recent[int(0.95 * (len(recent) - 1))] * 1000 if recent else 0.0,
+            'max_lateness_ms': self.max_lateness * 1000,
+            'last_lateness_ms': self.last_lateness * 1000,
+        }
+
+
+class OutputSink:
+    """
+    批量缓冲的输出端 - 所有输出线程/协程只把文本放进队列，
+    由唯一的写线程把一段时间内到达的记录合并成一次 write + flush。
+    终端或管道写得慢、积压超过 max_pending 条时:
+        'drop'  - 丢弃新记录并计数，计时线程永远不会被输出卡住
+        'block' - 生产者等待写线程追上（背压）
+    """
+    
+    POLICIES = ('drop', 'block')
+    _STOP = object()
+    
+    def __init__(self, stream=None, flush_interval: float = 0.02,
+                 buffer_size: int = 64 * 1024, max_pending: int = 10000,
+                 policy: str = 'drop'):
+        """
+        参数:
+        stream: 输出流, 默认每次写的时候取当前的 sys.stdout
+        flush_interval: 收到第一条记录后最多再等多久一起写出（秒）
+        buffer_size: 一次 write 最多合并的字符数
+        max_pending: 队列中最多积压的记录数
+        policy: 积压满时的处理方式, 'drop' 或 'block'
+        """
+        if policy not in self.POLICIES:
+            raise ValueError(f"积压策略必须是 {self.POLICIES} 之一")
+        if flush_interval < 0 or buffer_size <= 0 or max_pending <= 0:
+            raise ValueError("刷新间隔不能为负数，缓冲区大小和积压上限必须是正数")
+        self.stream = stream
+        self.flush_interval = flush_interval
+        self.buffer_size = buffer_size
+        self.max_pending = max_pending
+        self.policy = policy
+        
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self.dropped = 0
+        self.writes = 0
+        self.records_written = 0
+        self.max_backlog = 0
+        
+        self._writer = threading.Thread(target=self._write_loop, name="output-sink", daemon=True)
+        self._writer.start()
+    
+    @property
+    def backlog(self) -> int:
+        """队列中还没写出的记录数"""
+        return self._queue.qsize()
+    
+    def write(self, text: str) -> bool:
+        """
+        提交一条记录，返回是否被接受（drop 策略下积压满时返回 False）
+        """
+        if self.policy == 'block':
+            self._queue.put(text)
+            return True
+        try:
+            self._queue.put_nowait(text)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        return True
+    
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """等待目前为止提交的记录全部写出，返回是否在超时前完成"""
+        if not self._writer.is_alive():
+            return False
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+    
+    def close(self) -> None:
+        """写出剩余记录并结束写线程"""
+        if self._writer.is_alive():
+            self._queue.put(self._STOP)
+            self._writer.join()
+    
+    def _write_loop(self) -> None:
+        """写线程：等到第一条记录后再收集 flush_interval 秒内到达的记录，合并写出"""
+        while True:
+            item = self._queue.get()
+            batch: List[str] = []
+            markers: List[threading.Event] = []
+            size = 0
+            stopping = False
+            deadline = time.monotonic() + self.flush_interval
+            
+            while True:
+                if item is self._STOP:
+                    stopping = True
+                elif isinstance(item, threading.Event):
+                    markers.append(item)
+                    if not batch:
+                        break  # 没有待写内容，直接确认
+                else:
+                    batch.append(item)
+                    size += len(item)
+                if stopping or size >= self.buffer_size:
+                    break
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            
+            if batch:
+                stream = self.stream or sys.stdout
+                try:
+                    stream.write(''.join(batch))
+                    stream.flush()
+                except (OSError, ValueError):
+                    pass  # 输出端已关闭，丢弃这一批
+                self.writes += 1
+                self.records_written += len(batch)
+            self.max_backlog = max(self.max_backlog, self.backlog + len(batch))
+            for marker in markers:
+                marker.set()
+            if stopping:
+                return
+
+
+class ShardedCounter:
+    """
+    分片计数器 - 每个线程只修改自己的分片（按发射器名计数的字典），
+    自增时没有锁也没有竞争；读取时把所有分片加起来。
+    多个线程直接对同一个整数做 += 1 不是原子操作，会丢失计数
+    """
+    
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()  # 只在登记新分片、读取和清零时使用
+        self._shards: List[dict] = []
+        self._generation = 0
+    
+    def _shard(self) -> dict:
+        """当前线程的分片；第一次使用（或清零之后）时登记一个新分片"""
+        local = self._local
+        if getattr(local, 'generation', None) != self._generation:
+            with self._lock:
+                local.shard = {}
+                local.generation = self._generation
+                self._shards.append(local.shard)
+        return local.shard
+    
+    def increment(self, key=None, amount: int = 1) -> None:
+        """给当前线程分片中的 key 加 amount（key 一般是发射器名称）"""
+        shard = self._shard()
+        shard[key] = shard.get(key, 0) + amount
+    
+    def _snapshot(self) -> List[dict]:
+        with self._lock:
+            shards = list(self._shards)
+        # dict.copy() 持有GIL完成，不会看到写到一半的分片
+        return [shard.copy() for shard in shards]
+    
+    def total(self) -> int:
+        """所有分片的总和"""
+        return sum(sum(shard.values()) for shard in self._snapshot())
+    
+    def per_key(self) -> dict:
+        """每个 key 的计数（同一个 key 可能分布在多个线程的分片里）"""
+        counts = {}
+        for shard in self._snapshot():
+            for key, value in shard.items():
+                counts[key] = counts.get(key, 0) + value
+        return counts
+    
+    def reset(self) -> None:
+        """清零：丢弃所有分片，各线程下次自增时重新登记"""
+        with self._lock:
+            self._shards = []
+            self._generation += 1
+
+
 class TimedOutputManager:
     """定时输出管理器，提供多种输出模式和控制功能"""
     
-    def __init__(self):
+    def __init__(self, tick_policy: str = 'skip', sink: Optional[OutputSink] = None):
+        """
+        参数:
+        tick_policy: 输出超时后的处理策略, 见 DeadlineScheduler
+        sink: 输出端, 默认为写到标准输出的 OutputSink
+        """
+        if tick_policy not in DeadlineScheduler.POLICIES:
+            raise ValueError(f"超时策略必须是 {DeadlineScheduler.POLICIES} 之一")
+        self.tick_policy = tick_policy
+        self.sink = sink or OutputSink()
+        self.schedulers: List[DeadlineScheduler] = []  # 本次运行用到的调度器（多线程模式每个线程一个）
         self.is_running = False
         self.output_history = []
         self.start_time = None
-        self.total_outputs = 0
+        self.outputs = ShardedCounter()  # 按发射器分别计数，线程间不会丢失计数
         self.pause_event = threading.Event()
         self.stop_event = threading.Event()
         
         # 注册信号处理器（Ctrl+C优雅退出）
         signal.signal(signal.SIGINT, self._signal_handler)
     
+    def _emit(self, text: str = "", end: str = "\n") -> None:
+        """所有模式的输出都经过输出端，由写线程批量写出"""
+        self.sink.write(text + end)
+    
+    @property
+    def total_outputs(self) -> int:
+        """所有发射器的输出次数之和"""
+        return self.outputs.total()
+    
     def _signal_handler(self, signum, frame):
         """处理中断信号"""
-        print(f"\n\n收到中断信号，正在优雅退出...")
+        self._emit(f"\n\n收到中断信号，正在优雅退出...")
         self.stop()
         sys.exit(0)
     
+    def _scheduler(self, interval: float, first_deadline: Optional[float] = None,
+                   history: int = 1000) -> DeadlineScheduler:
+        """创建一个调度器并登记到本次运行的统计里"""
+        scheduler = DeadlineScheduler(interval, self.tick_policy, self.stop_event, first_deadline, history)
+        self.schedulers.append(scheduler)
+        return scheduler
+    
     def simple_output(self, message: str = "hello world", 
                      interval: float = 1.0, 
                      count: int = 10,
@@ -49,15 +380,13 @@ class TimedOutputManager:
         """
         self.start_time = time.time()
         self.is_running = True
-        self.total_outputs = 0
+        self.outputs.reset()
+        self.schedulers = []
         
-        print(f"开始输出: '{message}' (间隔{interval}秒, 共{count}次)")
-        print("-" * 50)
+        self._emit(f"开始输出: '{message}' (间隔{interval}秒, 共{count}次)")
+        self._emit("-" * 50)
         
-        for i in range(count):
-            if self.stop_event.is_set():
-                break
-                
+        for i in self._scheduler(interval).ticks(count):
             current_time = datetime.datetime.now().strftime("%H:%M:%S")
             output_msg = f"[{current_time}] {message}"
             
@@ -65,7 +394,7 @@ class TimedOutputManager:
                 progress = (i + 1) / count * 100
                 output_msg += f" (进度: {progress:.1f}%)"
             
-            print(output_msg)
+            self._emit(output_msg)
             
             # 记录输出历史
             self.output_history.append({
@@ -75,15 +404,12 @@ class TimedOutputManager:
                 'total': count
             })
             
-            self.total_outputs += 1
-            
-            # 最后一次输出不需要等待
-            if i < count - 1:
-                time.sleep(interval)
+            self.outputs.increment("基础输出")
         
         self.is_running = False
         elapsed_time = time.time() - self.start_time
-        print(f"\n输出完成! 总用时: {elapsed_time:.2f}秒")
+        self._emit(f"\n输出完成! 总用时: {elapsed_time:.2f}秒")
+        self.sink.flush()
     
     def countdown_output(self, message: str = "倒计时", 
                         start_num: int = 10,
@@ -91,26 +417,24 @@ class TimedOutputManager:
         """倒计时输出模式"""
         self.start_time = time.time()
         self.is_running = True
+        self.outputs.reset()
+        self.schedulers = []
         
-        print(f"倒计时开始: 从 {start_num} 到 0")
-        print("-" * 30)
+        self._emit(f"倒计时开始: 从 {start_num} 到 0")
+        self._emit("-" * 30)
         
-        for i in range(start_num, -1, -1):
-            if self.stop_event.is_set():
-                break
-                
+        for tick in self._scheduler(interval).ticks(start_num + 1):
+            i = start_num - tick
             current_time = datetime.datetime.now().strftime("%H:%M:%S")
             if i == 0:
-                print(f"[{current_time}] 🎉 {message} 完成! 🎉")
+                self._emit(f"[{current_time}] 🎉 {message} 完成! 🎉")
             else:
-                print(f"[{current_time}] {message}: {i}")
+                self._emit(f"[{current_time}] {message}: {i}")
             
-            self.total_outputs += 1
-            
-            if i > 0:
-                time.sleep(interval)
+            self.outputs.increment("倒计时")
         
         self.is_running = False
+        self.sink.flush()
     
     def random_message_output(self, messages: List[str], 
                              interval: float = 1.0,
@@ -121,25 +445,22 @@ class TimedOutputManager:
         
         self.start_time = time.time()
         self.is_running = True
+        self.outputs.reset()
+        self.schedulers = []
         
-        print(f"随机消息输出 (共{count}次, 间隔{interval}秒)")
-        print(f"消息库: {messages}")
-        print("-" * 50)
+        self._emit(f"随机消息输出 (共{count}次, 间隔{interval}秒)")
+        self._emit(f"消息库: {messages}")
+        self._emit("-" * 50)
         
-        for i in range(count):
-            if self.stop_event.is_set():
-                break
-                
+        for _ in self._scheduler(interval).ticks(count):
             message = random.choice(messages)
             current_time = datetime.datetime.now().strftime("%H:%M:%S")
-            print(f"[{current_time}] 🎲 {message}")
-            
-            self.total_outputs += 1
+            self._emit(f"[{current_time}] 🎲 {message}")
             
-            if i < count - 1:
-                time.sleep(interval)
+            self.outputs.increment("随机消息")
         
         self.is_running = False
+        self.sink.flush()
     
     def progress_bar_output(self, task_name: str = "处理中",
                            total_steps: int = 20,
@@ -147,14 +468,13 @@ class TimedOutputManager:
         """进度条输出模式"""
         self.start_time = time.time()
         self.is_running = True
+        self.outputs.reset()
+        self.schedulers = []
         
-        print(f"任务: {task_name}")
-        print("=" * 50)
+        self._emit(f"任务: {task_name}")
+        self._emit("=" * 50)
         
-        for i in range(total_steps + 1):
-            if self.stop_event.is_set():
-                break
-                
+        for i in self._scheduler(interval).ticks(total_steps + 1):
             progress = i / total_steps
             bar_length = 30
             filled_length = int(bar_length * progress)
@@ -164,37 +484,44 @@ class TimedOutputManager:
             
             current_time = datetime.datetime.now().strftime("%H:%M:%S")
             
-            print(f"\r[{current_time}] |{bar}| {percent:.1f}% ({i}/{total_steps})", end="")
+            self._emit(f"\r[{current_time}] |{bar}| {percent:.1f}% ({i}/{total_steps})", end="")
             
-            self.total_outputs += 1
-            
-            if i < total_steps:
-                time.sleep(interval)
+            self.outputs.increment("进度条")
         
-        print(f"\n✅ {task_name} 完成!")
+        self._emit(f"\n✅ {task_name} 完成!")
         self.is_running = False
+        self.sink.flush()
     
     def clock_output(self, duration: int = 60) -> None:
-        """时钟输出模式"""
+        """
+        时钟输出模式
+        截止时间对齐到系统时间的整秒之后，显示的是每个截止时间对应的秒，
+        所以不会因为调度抖动而跳秒或重复同一秒
+        """
         self.start_time = time.time()
         self.is_running = True
-        end_time = time.time() + duration
+        self.outputs.reset()
+        self.schedulers = []
+        
+        self._emit(f"数字时钟运行 {duration} 秒")
+        self._emit("=" * 30)
         
-        print(f"数字时钟运行 {duration} 秒")
-        print("=" * 30)
+        # 下一个整秒（留10毫秒余量，保证输出时系统时间已经进入这一秒）
+        now_wall, now_monotonic = time.time(), time.monotonic()
+        first_second = math.floor(now_wall) + 1
+        first_deadline = now_monotonic + (first_second - now_wall) + 0.01
         
-        while time.time() < end_time and not self.stop_event.is_set():
-            current_time = datetime.datetime.now()
-            time_str = current_time.strftime("%Y-%m-%d %H:%M:%S")
+        for k in self._scheduler(1.0, first_deadline).ticks(duration=duration):
+            time_str = datetime.datetime.fromtimestamp(first_second + k).strftime("%Y-%m-%d %H:%M:%S")
             
             # 清除当前行并输出新时间
-            print(f"\r🕐 {time_str}", end="", flush=True)
+            self._emit(f"\r🕐 {time_str}", end="")
             
-            self.total_outputs += 1
-            time.sleep(1)
+            self.outputs.increment("数字时钟")
         
-        print(f"\n⏰ 时钟停止运行")
+        self._emit(f"\n⏰ 时钟停止运行")
         self.is_running = False
+        self.sink.flush()
     
     def threaded_output(self, message: str = "多线程输出",
                        thread_count: int = 3,
@@ -203,25 +530,26 @@ class TimedOutputManager:
         """多线程输出模式"""
         self.start_time = time.time()
         self.is_running = True
+        self.outputs.reset()
+        self.schedulers = []
         
-        print(f"启动 {thread_count} 个输出线程，运行 {duration} 秒")
-        print("-" * 50)
+        self._emit(f"启动 {thread_count} 个输出线程，运行 {duration} 秒")
+        self._emit("-" * 50)
         
-        def worker(thread_id: int):
-            end_time = time.time() + duration
+        def worker(thread_id: int, scheduler: DeadlineScheduler):
             counter = 0
             
-            while time.time() < end_time and not self.stop_event.is_set():
+            for _ in scheduler.ticks(duration=duration):
                 current_time = datetime.datetime.now().strftime("%H:%M:%S")
                 counter += 1
-                print(f"[{current_time}] 线程{thread_id}: {message} #{counter}")
-                self.total_outputs += 1
-                time.sleep(interval)
+                self._emit(f"[{current_time}] 线程{thread_id}: {message} #{counter}")
+                self.outputs.increment(f"线程{thread_id}")
         
-        # 创建并启动线程
+        # 创建并启动线程（发射器很多时每个调度器少保留一些延迟记录）
+        history = max(10, EMITTER_HISTORY_BUDGET // max(thread_count, 1))
         threads = []
         for i in range(thread_count):
-            thread = threading.Thread(target=worker, args=(i+1,))
+            thread = threading.Thread(target=worker, args=(i+1, self._scheduler(interval, history=history)))
             threads.append(thread)
             thread.start()
         
@@ -230,34 +558,137 @@ class TimedOutputManager:
             thread.join()
         
         self.is_running = False
-        print(f"\n所有线程执行完毕!")
+        self._emit(f"\n所有线程执行完毕!")
+        self.sink.flush()
+    
+    def async_output(self, message: str = "协程输出",
+                     emitter_count: int = 3,
+                     interval: float = 1.0,
+                     duration: int = 10) -> None:
+        """
+        异步输出模式 - 与多线程模式的输出格式和停止方式相同，
+        但每个发射器是同一个事件循环上的协程，上万个发射器也只用一个线程
+        """
+        self.start_time = time.time()
+        self.is_running = True
+        self.outputs.reset()
+        self.schedulers = []
+        
+        self._emit(f"启动 {emitter_count} 个输出协程，运行 {duration} 秒")
+        self._emit("-" * 50)
+        
+        interrupted = asyncio.run(self._run_emitters(message, emitter_count, interval, duration))
+        if interrupted:
+            # 事件循环已经正常结束，这里再走和其他模式相同的退出流程
+            self._signal_handler(signal.SIGINT, None)
+        
+        self.is_running = False
+        self._emit(f"\n所有协程执行完毕!")
+        self.sink.flush()
+    
+    async def _run_emitters(self, message: str, emitter_count: int,
+                            interval: float, duration: float) -> bool:
+        """
+        在一个事件循环上运行全部发射器；stop_event 被设置时取消所有发射器
+        运行期间 Ctrl+C 只设置 stop_event（不能在事件循环里 sys.exit），返回是否因此中断
+        """
+        history = max(10, EMITTER_HISTORY_BUDGET // max(emitter_count, 1))
+        
+        async def emitter(emitter_id: int, scheduler: DeadlineScheduler):
+            counter = 0
+            async for _ in scheduler.async_ticks(duration=duration):
+                current_time = datetime.datetime.now().strftime("%H:%M:%S")
+                counter += 1
+                self._emit(f"[{current_time}] 协程{emitter_id}: {message} #{counter}")
+                self.outputs.increment(f"协程{emitter_id}")
+        
+        emitters = [asyncio.create_task(emitter(i + 1, self._scheduler(interval, history=history)))
+                    for i in range(emitter_count)]
+        
+        async def watch_stop():
+            # stop_event 是线程事件（信号处理器会设置它），这里定期检查
+            while not self.stop_event.is_set():
+                await asyncio.sleep(0.05)
+            for task in emitters:
+                task.cancel()
+        
+        loop = asyncio.get_running_loop()
+        interrupted = threading.Event()
+        previous_handler = signal.getsignal(signal.SIGINT)
+        
+        def on_interrupt():
+            interrupted.set()
+            self.stop_event.set()
+        
+        try:
+            loop.add_signal_handler(signal.SIGINT, on_interrupt)
+            installed = True
+        except (NotImplementedError, RuntimeError):  # Windows 或非主线程
+            installed = False
+        
+        watcher = asyncio.create_task(watch_stop())
+        try:
+            await asyncio.gather(*emitters, return_exceptions=True)
+        finally:
+            watcher.cancel()
+            if installed:
+                loop.remove_signal_handler(signal.SIGINT)
+                signal.signal(signal.SIGINT, previous_handler)
+        return interrupted.is_set()
     
     def stop(self) -> None:
         """停止输出"""
         self.stop_event.set()
         self.is_running = False
-        print(f"\n输出已停止!")
+        self._emit(f"\n输出已停止!")
+        self.sink.flush()
     
     def pause(self) -> None:
         """暂停输出"""
         self.pause_event.clear()
-        print(f"\n输出已暂停，输入 resume 恢复")
+        self._emit(f"\n输出已暂停，输入 resume 恢复")
+        self.sink.flush()
     
     def resume(self) -> None:
         """恢复输出"""
         self.pause_event.set()
-        print(f"\n输出已恢复")
+        self._emit(f"\n输出已恢复")
+        self.sink.flush()
     
-    def show_statistics(self) -> None:
-        """显示统计信息"""
+    def show_statistics(self, limit: int = 10) -> None:
+        """显示统计信息（limit: 最多列出多少个发射器）"""
         if self.start_time:
             elapsed = time.time() - self.start_time
-            rate = self.total_outputs / elapsed if elapsed > 0 else 0
+            per_emitter = self.outputs.per_key()
+            total = sum(per_emitter.values())
+            rate = total / elapsed if elapsed > 0 else 0
             
             print(f"\n📊 统计信息:")
-            print(f"总输出次数: {self.total_outputs}")
+            print(f"总输出次数: {total}")
             print(f"运行时间: {elapsed:.2f} 秒")
             print(f"输出频率: {rate:.2f} 次/秒")
+            if per_emitter:
+                ranked = sorted(per_emitter.items(), key=lambda item: item[1], reverse=True)
+                print(f"发射器: {len(ranked)} 个 | 最多 {ranked[0][1]} 次 | 最少 {ranked[-1][1]} 次")
+                for name, count in ranked[:limit]:
+                    emitter_rate = count / elapsed if elapsed > 0 else 0
+                    print(f"  {name}: {count} 次 ({emitter_rate:.2f} 次/秒)")
+                if len(ranked) > limit:
+                    print(f"  ... 另有 {len(ranked) - limit} 个发射器")
+            sink = self.sink
+            print(f"输出端: {sink.records_written} 条记录合并为 {sink.writes} 次写入 | "
+                  f"丢弃 {sink.dropped} 条 | 最大积压 {sink.max_backlog} 条")
+            
+            if self.schedulers:
+                summaries = [scheduler.summary() for scheduler in self.schedulers]
+                ticks = sum(s['ticks'] for s in summaries)
+                mean = (sum(s['mean_lateness_ms'] * s['ticks'] for s in summaries) / ticks) if ticks else 0.0
+                print(f"调度策略: {self.tick_policy}")
+                print(f"平均延迟: {mean:.2f} 毫秒 | "
+                      f"p95延迟: {max(s['p95_lateness_ms'] for s in summaries):.2f} 毫秒 | "
+                      f"最大延迟: {max(s['max_lateness_ms'] for s in summaries):.2f} 毫秒")
+                print(f"最后一次延迟(漂移): {max(s['last_lateness_ms'] for s in summaries):.2f} 毫秒 | "
+                      f"跳过的输出: {sum(s['skipped'] for s in summaries)}")
     
     def show_history(self, limit: int = 10) -> None:
         """显示输出历史"""
@@ -291,6 +722,155 @@ class TimedOutputManager:
         except Exception as e:
             print(f"❌ 保存日志失败: {e}")
 
+def _resident_memory_mb() -> Optional[float]:
+    """当前进程的常驻内存（MB），拿不到时返回 None"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def benchmark_emitter_modes(thread_counts=(10, 100, 1000),
+                            async_counts=(10, 100, 1000, 10000),
+                            interval: float = 0.5,
+                            duration: float = 3.0) -> List[dict]:
+    """
+    对比多线程模式和异步模式: 线程数、常驻内存增量、调度延迟（抖动）
+    输出重定向到空设备，只测调度本身；返回每次运行的测量结果
+    """
+    results = []
+    runs = [('thread', n) for n in thread_counts] + [('async', n) for n in async_counts]
+    
+    devnull = open(os.devnull, 'w', encoding='utf-8')
+    for mode, count in runs:
+        manager = TimedOutputManager(sink=OutputSink(stream=devnull))
+        baseline_threads = threading.active_count()
+        baseline_rss = _resident_memory_mb()
+        peak = {'threads': baseline_threads, 'rss': baseline_rss}
+        sampling = threading.Event()
+        
+        def sample():
+            while not sampling.wait(0.05):
+                peak['threads'] = max(peak['threads'], threading.active_count())
+                rss = _resident_memory_mb()
+                if rss is not None:
+                    peak['rss'] = max(peak['rss'], rss)
+        
+        sampler = threading.Thread(target=sample, daemon=True)
+        sampler.start()
+        started = time.perf_counter()
+        error = None
+        try:
+            with contextlib.redirect_stdout(devnull):
+                if mode == 'thread':
+                    manager.threaded_output("基准", count, interval, duration)
+                else:
+                    manager.async_output("基准", count, interval, duration)
+        except RuntimeError as e:  # 线程太多时可能无法创建
+            error = str(e)
+            manager.stop_event.set()
+        sampling.set()
+        sampler.join()
+        manager.sink.close()
+        
+        lateness = sorted(value for scheduler in manager.schedulers for value in scheduler.lateness)
+        ticks = sum(scheduler.ticks_fired for scheduler in manager.schedulers)
+        results.append({
+            'mode': mode,
+            'emitters': count,
+            'threads': peak['threads'] - baseline_threads - 1,  # 不算采样线程
+            'rss_mb': (peak['rss'] - baseline_rss) if baseline_rss is not None else None,
+            'ticks': ticks,
+            'expected_ticks': count * math.ceil(duration / interval),
+            'mean_lateness_ms': sum(lateness) / len(lateness) * 1000 if lateness else 0.0,
+            'p95_lateness_ms': lateness[int(0.95 * (len(lateness) - 1))] * 1000 if lateness else 0.0,
+            'max_lateness_ms': lateness[-1] * 1000 if lateness else 0.0,
+            'wall_s': time.perf_counter() - started,
+            'error': error
+        })
+    devnull.close()
+    
+    print(f"\n{'模式':<8}{'发射器':>8}{'线程':>8}{'内存增量MB':>12}{'输出/应输出':>16}"
+          f"{'平均延迟ms':>12}{'p95延迟ms':>12}{'最大延迟ms':>12}")
+    for r in results:
+        rss = f"{r['rss_mb']:.1f}" if r['rss_mb'] is not None else "-"
+        print(f"{r['mode']:<8}{r['emitters']:>8}{r['threads']:>8}{rss:>12}"
+              f"{r['ticks']:>9}/{r['expected_ticks']:<6}{r['mean_lateness_ms']:>12.2f}"
+              f"{r['p95_lateness_ms']:>12.2f}{r['max_lateness_ms']:>12.2f}"
+              f"{'  ' + r['error'] if r['error'] else ''}")
+    return results
+
+
+def stress_test_counters(thread_count: int = 8, increments: int = 200_000) -> dict:
+    """
+    计数器压力测试: thread_count 个线程各自增 increments 次，
+    对比直接 += 1 的共享整数和 ShardedCounter，统计丢失的计数和每秒自增次数
+    （共享整数是否丢计数取决于解释器版本和线程切换时机，分片计数器在任何情况下都不应丢失）
+    """
+    expected = thread_count * increments
+    results = {}
+    
+    class Shared:
+        value = 0
+    
+    def run(worker) -> float:
+        barrier = threading.Barrier(thread_count + 1)
+        
+        def target(thread_id: int):
+            barrier.wait()
+            worker(thread_id)
+        
+        threads = [threading.Thread(target=target, args=(i,)) for i in range(thread_count)]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        started = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - started
+    
+    # 切换间隔调小，让线程在 += 的读和写之间更频繁地被打断
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        shared = Shared()
+        
+        def plain_worker(thread_id: int):
+            for _ in range(increments):
+                shared.value += 1
+        
+        elapsed = run(plain_worker)
+        results['shared_int'] = {'count': shared.value, 'seconds': elapsed}
+        
+        counter = ShardedCounter()
+        
+        def sharded_worker(thread_id: int):
+            increment = counter.increment
+            key = f"线程{thread_id}"
+            for _ in range(increments):
+                increment(key)
+        
+        elapsed = run(sharded_worker)
+        per_key = counter.per_key()
+        results['sharded'] = {'count': counter.total(), 'seconds': elapsed,
+                              'per_key_ok': all(value == increments for value in per_key.values())
+                                            and len(per_key) == thread_count}
+    finally:
+        sys.setswitchinterval(switch_interval)
+    
+    print(f"\n{thread_count} 个线程 × {increments} 次自增，应为 {expected}")
+    for name, result in results.items():
+        lost = expected - result['count']
+        speed = result['count'] / result['seconds'] if result['seconds'] > 0 else 0
+        print(f"  {name:<12} 结果 {result['count']:>12} | 丢失 {lost:>10} | {speed / 1e6:.2f} 百万次/秒")
+    if not results['sharded']['per_key_ok'] or results['sharded']['count'] != expected:
+        print("❌ 分片计数器丢失了计数")
+    else:
+        print("✅ 分片计数器没有丢失任何计数")
+    return results
+
+
 def demonstrate_basic_functionality():
     """演示基本功能"""
     print("=== 基础演示 ===")
@@ -316,13 +896,17 @@ def interactive_mode():
         print("7. 查看统计信息")
         print("8. 查看输出历史")
         print("9. 保存日志")
+        print("10. 异步多发射器输出")
+        print("11. 多线程/异步性能对比")
+        print("12. 计数器压力测试")
         print("0. 退出")
         print("-" * 60)
         
         try:
-            choice = input("请选择功能 (0-9): ").strip()
+            choice = input("请选择功能 (0-12): ").strip()
             
             if choice == '0':
+                manager.sink.close()
                 print("👋 感谢使用！再见！")
                 break
             
@@ -383,6 +967,23 @@ def interactive_mode():
                 filename = input("文件名 (留空自动生成): ").strip() or None
                 manager.save_log(filename)
             
+            elif choice == '10':
+                message = input("输出消息 (默认: 协程输出): ").strip() or "协程输出"
+                emitter_count = int(input("发射器数量 (默认: 3): ") or "3")
+                interval = float(input("时间间隔/秒 (默认: 1.0): ") or "1.0")
+                duration = int(input("运行时长/秒 (默认: 10): ") or "10")
+                
+                manager.async_output(message, emitter_count, interval, duration)
+            
+            elif choice == '11':
+                duration = float(input("每组运行时长/秒 (默认: 3): ") or "3")
+                benchmark_emitter_modes(duration=duration)
+            
+            elif choice == '12':
+                thread_count = int(input("线程数量 (默认: 8): ") or "8")
+                increments = int(input("每个线程的自增次数 (默认: 200000): ") or "200000")
+                stress_test_counters(thread_count, increments)
+            
             else:
                 print("❌ 无效选择，请重新输入！")
         